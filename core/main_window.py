@@ -1314,6 +1314,8 @@ class ScalperMainWindow(QMainWindow):
                 return
 
         logger.info("Proceeding with application shutdown.")
+        self.trade_logger.flush()
+        self.position_manager.pnl_logger.flush()
         self.save_window_state()
         event.accept()
 
@@ -2020,36 +2022,22 @@ class ScalperMainWindow(QMainWindow):
             self.statusBar().showMessage(f"Failed to fetch orders: {e}", 3000)
 
     def _update_performance(self):
-        all_trades = self.trade_logger.get_all_trades()
-        completed_trades = [trade for trade in all_trades if trade.get('pnl', 0.0) != 0.0]
-        total_pnl = sum(trade.get('pnl', 0.0) for trade in completed_trades)
-        winning_trades = [trade for trade in completed_trades if trade.get('pnl', 0.0) > 0]
-        losing_trades = [trade for trade in completed_trades if trade.get('pnl', 0.0) < 0]
-
-        total_completed_trades = len(completed_trades)
-        metrics = {
-            'total_trades': total_completed_trades,
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'total_pnl': total_pnl,
-            'win_rate': (len(winning_trades) / total_completed_trades * 100) if total_completed_trades else 0,
-            'avg_profit': (sum(t.get('pnl', 0.0) for t in winning_trades) / len(
-                winning_trades)) if winning_trades else 0,
-            'avg_loss': abs(
-                sum(t.get('pnl', 0.0) for t in losing_trades) / len(losing_trades)) if losing_trades else 0,
-        }
-
-        if self.performance_dialog and self.performance_dialog.isVisible() and hasattr(self.performance_dialog,
-                                                                                       'update_metrics'):
-            self.performance_dialog.update_metrics(metrics)
+        # The dashboard pulls from PnlLogger itself; refresh() is coalesced and
+        # short-circuits when the P&L history is unchanged.
+        if self.performance_dialog and self.performance_dialog.isVisible():
+            self.performance_dialog.refresh()
 
     def _update_account_summary_widget(self):
-        all_trades = self.trade_logger.get_all_trades()
-        winning_trades = [t for t in all_trades if t.get("pnl", 0.0) > 0]
-        losing_trades = [t for t in all_trades if t.get("pnl", 0.0) < 0]
-        total_trades = len(winning_trades) + len(losing_trades)
-
-        win_rate = (len(winning_trades) / total_trades * 100) if total_trades else 0.0
+        winning_trades = losing_trades = 0
+        for trade in self.trade_logger.iter_trades():
+            pnl = trade["pnl"]
+            if pnl > 0:
+                winning_trades += 1
+            elif pnl < 0:
+                losing_trades += 1
+        total_trades = winning_trades + losing_trades
+
+        win_rate = (winning_trades / total_trades * 100) if total_trades else 0.0
 
         unrealized_pnl = self.position_manager.get_total_pnl()
         realized_pnl = self.position_manager.get_realized_day_pnl()
@@ -569,7 +569,7 @@ class MarketMonitorDialog(QDialog):
             today_date, prev_day_date = unique_dates[-1], unique_dates[-2]
             today_df = df[df.index.date == today_date]
             prev_day_df = df[df.index.date == prev_day_date]
-            cpr_levels = CPRCalculator.get_previous_day_cpr(prev_day_df)
+            cpr_levels = CPRCalculator.get_previous_day_cpr_cached(symbol, prev_day_date, prev_day_df)
             day_separator_pos = len(prev_day_df)
             two_day_df = pd.concat([prev_day_df, today_df])
             chart.set_data(symbol, two_day_df, day_separator_pos, cpr_levels)
@@ -8,10 +8,23 @@ from PySide6.QtGui import (QBrush, QColor, QCloseEvent, QFont, QLinearGradient,
 from PySide6.QtWidgets import (QAbstractItemView, QCheckBox, QComboBox, QDialog, QFrame, QHBoxLayout,
                                QHeaderView, QLabel, QPushButton, QStyledItemDelegate, QTableWidget,
                                QTableWidgetItem, QVBoxLayout, QWidget)
-from scipy.stats import norm
+import numpy as np
+from scipy.special import ndtr
 
 from kiteconnect import KiteConnect
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from py_vollib_vectorized import vectorized_implied_volatility
+    VOLLIB_AVAILABLE = True
+except ImportError:
+    VOLLIB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # --- Constants for easy theme management ---
@@ -39,87 +52,275 @@ INDEX_SYMBOL_MAP = {
 # ---------------------------------------------------------------------------------
 # UPDATED: Real Black-Scholes and Greeks Calculation Logic
 # ---------------------------------------------------------------------------------
-def black_scholes_price(S, K, T, r, sigma, is_call):
-    if T <= 0 or sigma <= 0: return 0
-    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-
+# Scalar kernels use erf-based N(x) and an inline pdf so they compile under
+# Numba's nopython mode; without Numba they still skip the scipy.stats detour.
+# The chain itself goes through calculate_greeks_batch(); the scalar API is
+# kept for external callers and compiles lazily on first use.
+_INV_SQRT2 = 0.7071067811865476
+_INV_SQRT_2PI = 0.3989422804014327
+
+
+def _bs_price_kernel(S, K, T, r, sigma, is_call):
+    if T <= 0 or sigma <= 0:
+        return 0.0
+    sqrt_t = math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    disc_k = K * math.exp(-r * T)
     if is_call:
-        return S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
-    else:
-        return K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+        return S * 0.5 * (1.0 + math.erf(d1 * _INV_SQRT2)) - disc_k * 0.5 * (1.0 + math.erf(d2 * _INV_SQRT2))
+    return disc_k * 0.5 * (1.0 + math.erf(-d2 * _INV_SQRT2)) - S * 0.5 * (1.0 + math.erf(-d1 * _INV_SQRT2))
 
 
-def implied_volatility(S, K, T, r, market_price, is_call, tolerance=1e-5, max_iterations=100):
+def _iv_full_kernel(S, K, T, r, market_price, is_call, tolerance, max_iterations):
+    """Newton-Raphson IV; returns (sigma, d1, d2) with d1/d2 evaluated at the returned sigma."""
+    if T <= 0:
+        return 0.0, 0.0, 0.0
+    sqrt_t = math.sqrt(T)
+    log_sk = math.log(S / K)
+    disc_k = K * math.exp(-r * T)
     sigma = 0.3  # initial guess
     for _ in range(max_iterations):
-        price = black_scholes_price(S, K, T, r, sigma, is_call)
-        if T <= 0: return 0
-        d1_for_vega = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-        vega = S * norm.pdf(d1_for_vega) * math.sqrt(T)
+        d1 = (log_sk + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+        d2 = d1 - sigma * sqrt_t
+        if is_call:
+            price = S * 0.5 * (1.0 + math.erf(d1 * _INV_SQRT2)) - disc_k * 0.5 * (1.0 + math.erf(d2 * _INV_SQRT2))
+        else:
+            price = disc_k * 0.5 * (1.0 + math.erf(-d2 * _INV_SQRT2)) - S * 0.5 * (1.0 + math.erf(-d1 * _INV_SQRT2))
+        vega = S * _INV_SQRT_2PI * math.exp(-0.5 * d1 * d1) * sqrt_t
         diff = price - market_price
 
         if abs(diff) < tolerance:
-            return sigma
+            return sigma, d1, d2
 
         if vega == 0:  # Avoid division by zero
-            return sigma
+            return sigma, d1, d2
 
         sigma -= diff / vega
         if sigma <= 0:
             sigma = 1e-4
-    return max(sigma, 1e-4)
+    sigma = max(sigma, 1e-4)
+    d1 = (log_sk + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+    return sigma, d1, d1 - sigma * sqrt_t
 
 
-def calculate_greeks(spot_price, strike_price, expiry_date, option_price, is_call, interest_rate=0.06):
-    days_to_expiry = max((expiry_date - date.today()).days, 0)
-    # If option has expired, Greeks are zero
-    if days_to_expiry == 0:
-        return {'iv': 0, 'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
+if NUMBA_AVAILABLE:
+    _bs_price_impl = njit(cache=True, fastmath=True)(_bs_price_kernel)
+    _iv_full_impl = njit(cache=True, fastmath=True)(_iv_full_kernel)
+else:
+    _bs_price_impl = _bs_price_kernel
+    _iv_full_impl = _iv_full_kernel
 
-    T = days_to_expiry / 365.0
-    S = spot_price
-    K = strike_price
-    r = interest_rate
 
-    # If option price is zero, IV can't be calculated
-    if option_price <= 0:
-        return {'iv': 0, 'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
-
-    iv = implied_volatility(S, K, T, r, option_price, is_call)
+def _greeks_kernel(S, K, T, r, option_price, is_call):
+    """Returns (iv, delta, theta, gamma, vega) for a priced option with T > 0."""
+    # d1/d2 come back from the solver at the converged sigma
+    iv, d1, d2 = _iv_full_impl(S, K, T, r, option_price, is_call, 1e-5, 100)
+    sqrt_t = math.sqrt(T)
 
     # --- FIX: Added a check to prevent division by zero ---
-    if iv * math.sqrt(T) == 0:
-        return {'iv': iv * 100, 'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
-
-    d1 = (math.log(S / K) + (r + 0.5 * iv ** 2) * T) / (iv * math.sqrt(T))
-    d2 = d1 - iv * math.sqrt(T)
+    if iv * sqrt_t == 0:
+        return iv * 100, 0.0, 0.0, 0.0, 0.0
 
-    delta = norm.cdf(d1) if is_call else norm.cdf(d1) - 1
+    cdf_d1 = 0.5 * (1.0 + math.erf(d1 * _INV_SQRT2))
+    cdf_d2 = 0.5 * (1.0 + math.erf(d2 * _INV_SQRT2))
+    pdf_d1 = _INV_SQRT_2PI * math.exp(-0.5 * d1 * d1)
+    disc_k = r * K * math.exp(-r * T)
+    decay = -S * pdf_d1 * iv / (2 * sqrt_t)
 
-    # --- FIX: Corrected the Theta calculation for Puts ---
     if is_call:
-        theta = (
-                        -S * norm.pdf(d1) * iv / (2 * math.sqrt(T))
-                        - r * K * math.exp(-r * T) * norm.cdf(d2)
-                ) / 365
-    else:  # Put option
-        theta = (
-                        -S * norm.pdf(d1) * iv / (2 * math.sqrt(T))
-                        + r * K * math.exp(-r * T) * norm.cdf(-d2)
-                ) / 365
-
-    gamma = norm.pdf(d1) / (S * iv * math.sqrt(T))
-    vega = S * norm.pdf(d1) * math.sqrt(T) / 100
+        delta = cdf_d1
+        theta = (decay - disc_k * cdf_d2) / 365
+    else:  # Put option, N(-x) = 1 - N(x)
+        delta = cdf_d1 - 1
+        theta = (decay + disc_k * (1.0 - cdf_d2)) / 365
+
+    gamma = pdf_d1 / (S * iv * sqrt_t)
+    vega = S * pdf_d1 * sqrt_t / 100
+    return iv * 100, delta, theta, gamma, vega
+
+
+if NUMBA_AVAILABLE:
+    _greeks_impl = njit(cache=True, fastmath=True)(_greeks_kernel)
+else:
+    _greeks_impl = _greeks_kernel
+
+
+def black_scholes_price(S, K, T, r, sigma, is_call):
+    return _bs_price_impl(float(S), float(K), float(T), float(r), float(sigma), bool(is_call))
+
+
+def implied_volatility(S, K, T, r, market_price, is_call, tolerance=1e-5, max_iterations=100):
+    return _iv_full_impl(float(S), float(K), float(T), float(r), float(market_price), bool(is_call),
+                         float(tolerance), int(max_iterations))[0]
+
+
+def calculate_greeks(spot_price, strike_price, expiry_date, option_price, is_call, interest_rate=0.06,
+                     today: Optional[date] = None):
+    if today is None:
+        today = date.today()
+    days_to_expiry = max((expiry_date - today).days, 0)
+    # If option has expired, Greeks are zero
+    if days_to_expiry == 0:
+        return {'iv': 0, 'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
+
+    # If option price is zero, IV can't be calculated
+    if option_price <= 0:
+        return {'iv': 0, 'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
 
+    iv, delta, theta, gamma, vega = _greeks_impl(
+        float(spot_price), float(strike_price), days_to_expiry / 365.0, float(interest_rate),
+        float(option_price), bool(is_call)
+    )
     return {
-        'iv': iv * 100,
+        'iv': iv,
         'delta': delta,
         'theta': theta,
         'gamma': gamma,
         'vega': vega
     }
 
+
+def _norm_pdf(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def implied_volatility_batch(S, K, T, r, market_prices, is_calls, tolerance=1e-5, max_iterations=100):
+    """
+    IV for a whole ladder at once. Uses Jaeckel's "Let's Be Rational" via
+    py_vollib_vectorized when installed; rows it rejects (e.g. prices below
+    intrinsic) and installs without it go through the batched Newton solver.
+    """
+    return _implied_volatility_batch_full(S, K, T, r, market_prices, is_calls, tolerance, max_iterations)[0]
+
+
+def _implied_volatility_batch_full(S, K, T, r, market_prices, is_calls, tolerance=1e-5, max_iterations=100):
+    """implied_volatility_batch() returning (sigma, d1, d2) with d1/d2 evaluated at the returned sigma."""
+    global VOLLIB_AVAILABLE
+    K = np.asarray(K, dtype=np.float64)
+    market_prices = np.asarray(market_prices, dtype=np.float64)
+    is_calls = np.asarray(is_calls, dtype=bool)
+
+    if T <= 0:
+        return np.zeros(K.shape), np.zeros(K.shape), np.zeros(K.shape)
+    if not VOLLIB_AVAILABLE or K.size == 0:
+        return _implied_volatility_newton(S, K, T, r, market_prices, is_calls, tolerance, max_iterations)
+
+    flags = np.where(is_calls, 'c', 'p')
+    try:
+        sigma = np.asarray(vectorized_implied_volatility(
+            market_prices, S, K, T, r, flags, model='black_scholes', return_as='numpy', on_error='ignore'
+        ), dtype=np.float64).reshape(K.shape)
+    except Exception as e:
+        # A broken install (e.g. numba/py_vollib version mismatch) would fail on every tick
+        logger.warning(f"py_vollib_vectorized IV failed, falling back to Newton solver: {e}")
+        VOLLIB_AVAILABLE = False
+        return _implied_volatility_newton(S, K, T, r, market_prices, is_calls, tolerance, max_iterations)
+
+    sqrt_t = math.sqrt(T)
+    bad = ~np.isfinite(sigma) | (sigma <= 0)
+    good = ~bad
+    d1 = np.empty(K.shape)
+    sigma[good] = np.maximum(sigma[good], 1e-4)
+    d1[good] = (np.log(S / K[good]) + (r + 0.5 * sigma[good] ** 2) * T) / (sigma[good] * sqrt_t)
+    if bad.any():
+        sigma[bad], d1[bad], _ = _implied_volatility_newton(
+            S, K[bad], T, r, market_prices[bad], is_calls[bad], tolerance, max_iterations
+        )
+    return sigma, d1, d1 - sigma * sqrt_t
+
+
+def _implied_volatility_newton(S, K, T, r, market_prices, is_calls, tolerance, max_iterations):
+    """
+    Same iteration as implied_volatility(), with converged rows masked out
+    instead of breaking. Returns (sigma, d1, d2) like _iv_full_kernel.
+    """
+    sigma = np.full(K.shape, 0.3)
+    d1_out = np.empty(K.shape)
+    # sigma each row's d1_out was evaluated at; NaN until first evaluated
+    d1_sigma = np.full(K.shape, np.nan)
+
+    sqrt_t = math.sqrt(T)
+    log_sk = np.log(S / K)
+    disc_k = K * math.exp(-r * T)
+    active = np.arange(K.size)
+
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+        sig = sigma[active]
+        d1 = (log_sk[active] + (r + 0.5 * sig * sig) * T) / (sig * sqrt_t)
+        d2 = d1 - sig * sqrt_t
+        d1_out[active] = d1
+        d1_sigma[active] = sig
+        call = is_calls[active]
+        price = np.where(call,
+                         S * ndtr(d1) - disc_k[active] * ndtr(d2),
+                         disc_k[active] * ndtr(-d2) - S * ndtr(-d1))
+        vega = S * _norm_pdf(d1) * sqrt_t
+        diff = price - market_prices[active]
+
+        # Converged or flat-vega rows keep their current sigma
+        keep = (np.abs(diff) >= tolerance) & (vega != 0)
+        active = active[keep]
+        new_sig = sig[keep] - diff[keep] / vega[keep]
+        sigma[active] = np.where(new_sig <= 0, 1e-4, new_sig)
+
+    sigma = np.maximum(sigma, 1e-4)
+    # Only rows that ran out of iterations (or were clamped) moved past their last d1
+    stale = sigma != d1_sigma
+    if stale.any():
+        sig = sigma[stale]
+        d1_out[stale] = (log_sk[stale] + (r + 0.5 * sig * sig) * T) / (sig * sqrt_t)
+    return sigma, d1_out, d1_out - sigma * sqrt_t
+
+
+def calculate_greeks_batch(spot_price, strikes, expiry_date, option_prices, is_calls, interest_rate=0.06,
+                           today: Optional[date] = None):
+    """
+    Vectorised calculate_greeks() over a ladder of options sharing one spot
+    and expiry. Returns a dict of arrays keyed like calculate_greeks().
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    option_prices = np.asarray(option_prices, dtype=np.float64)
+    is_calls = np.asarray(is_calls, dtype=bool)
+    n = strikes.size
+    out = {k: np.zeros(n) for k in ('iv', 'delta', 'theta', 'gamma', 'vega')}
+
+    if today is None:
+        today = date.today()
+    days_to_expiry = max((expiry_date - today).days, 0)
+    if days_to_expiry == 0 or n == 0:
+        return out
+
+    T = days_to_expiry / 365.0
+    S = spot_price
+    r = interest_rate
+
+    # If option price is zero, IV can't be calculated
+    priced = option_prices > 0
+    if not priced.any():
+        return out
+    K = strikes[priced]
+    calls = is_calls[priced]
+
+    # d1/d2 come back from the solver at the converged sigma
+    iv, d1, d2 = _implied_volatility_batch_full(S, K, T, r, option_prices[priced], calls)
+
+    sqrt_t = math.sqrt(T)
+    cdf_d1 = ndtr(d1)
+    cdf_d2 = ndtr(d2)
+    pdf_d1 = _norm_pdf(d1)
+    disc_k = r * K * math.exp(-r * T)
+    decay = -S * pdf_d1 * iv / (2 * sqrt_t)
+
+    out['iv'][priced] = iv * 100
+    out['delta'][priced] = np.where(calls, cdf_d1, cdf_d1 - 1)
+    out['theta'][priced] = np.where(calls, decay - disc_k * cdf_d2, decay + disc_k * (1.0 - cdf_d2)) / 365
+    out['gamma'][priced] = pdf_d1 / (S * iv * sqrt_t)
+    out['vega'][priced] = S * pdf_d1 * sqrt_t / 100
+    return out
+
 # ---------------------------------------------------------------------------------
 
 def _format_large_number(n: float) -> str:
@@ -452,6 +653,9 @@ class OptionChainWidget(QWidget):
         self.expiry_date = None
         self.lot_size = 1
         self.show_per_lot = False
+        # Inputs of the last batch greeks solve and its per-leg results
+        self._greeks_key = None
+        self._greeks_by_leg: Dict = {}
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 5, 10, 10)
@@ -523,6 +727,30 @@ class OptionChainWidget(QWidget):
                 if quote := market_data.get(f"NFO:{put_contract['tradingsymbol']}"):
                     max_put_oi = max(max_put_oi, quote.get('oi', 0))
 
+        # Greeks for every displayed call and put in one vectorised pass
+        legs = []
+        for strike in display_strikes:
+            strike_map = contracts_data.get(strike, {})
+            for side, opt_type in (('call', 'CE'), ('put', 'PE')):
+                if contract := strike_map.get(opt_type):
+                    ltp = market_data.get(f"NFO:{contract['tradingsymbol']}", {}).get('last_price', 0)
+                    legs.append((strike, side, contract['strike'], ltp))
+        # Refreshes with no change in spot, premiums or days to expiry reuse the last solve
+        greeks_key = (underlying_ltp, expiry_date, date.today(), tuple(legs))
+        if greeks_key != self._greeks_key:
+            greeks = calculate_greeks_batch(
+                underlying_ltp,
+                [leg[2] for leg in legs],
+                expiry_date,
+                [leg[3] for leg in legs],
+                [leg[1] == 'call' for leg in legs],
+                today=greeks_key[2],
+            )
+            greek_rows = zip(greeks['iv'], greeks['delta'], greeks['theta'], greeks['gamma'], greeks['vega'])
+            self._greeks_by_leg = {(leg[0], leg[1]): row for leg, row in zip(legs, greek_rows)}
+            self._greeks_key = greeks_key
+        greeks_by_leg = self._greeks_by_leg
+
         for strike in display_strikes:
             row_pos = self.table.rowCount()
             self.table.insertRow(row_pos)
@@ -534,20 +762,18 @@ class OptionChainWidget(QWidget):
 
             if call_contract := contracts_data.get(strike, {}).get('CE'):
                 self._populate_side(row_pos, 'call', call_contract, market_data, strike < underlying_ltp, is_atm_strike,
-                                    max_call_oi)
+                                    max_call_oi, greeks_by_leg[(strike, 'call')])
             if put_contract := contracts_data.get(strike, {}).get('PE'):
                 self._populate_side(row_pos, 'put', put_contract, market_data, strike > underlying_ltp, is_atm_strike,
-                                    max_put_oi)
+                                    max_put_oi, greeks_by_leg[(strike, 'put')])
 
         self.table.setUpdatesEnabled(True)
-    def _populate_side(self, row, side, contract, market_data, is_itm, is_atm, max_oi):
+    def _populate_side(self, row, side, contract, market_data, is_itm, is_atm, max_oi, greeks):
         quote_key = f"NFO:{contract.get('tradingsymbol')}"
         data = market_data.get(quote_key, {})
         ltp = data.get('last_price', 0)
 
-        greeks = calculate_greeks(self.underlying_ltp, contract['strike'], self.expiry_date, ltp, side == 'call')
-
-        iv, delta, theta, gamma, vega = [greeks.get(k, 0.0) for k in ['iv', 'delta', 'theta', 'gamma', 'vega']]
+        iv, delta, theta, gamma, vega = greeks
         oi = data.get('oi', 0)
 
         display_ltp = ltp * self.lot_size if self.show_per_lot else ltp
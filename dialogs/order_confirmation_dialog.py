@@ -7,8 +7,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 # --- Add imports for QMouseEvent and QShowEvent ---
 from PySide6.QtGui import QMouseEvent, QShowEvent
-import locale
-locale.setlocale(locale.LC_ALL, 'en_IN')
+from utils.formatters import format_inr
 try:
     from src.utils.data_models import OptionType
 except ImportError:
@@ -32,6 +31,7 @@ class OrderConfirmationDialog(QDialog):
     def __init__(self, parent, order_details: dict):
         super().__init__(parent)
         self.order_details = order_details
+        self._option_name, self._option_type_char = self._resolve_option_type(order_details)
         self._drag_pos = None
         self.strikes_scroll_area = None
         self._setup_dialog()
@@ -79,6 +79,7 @@ class OrderConfirmationDialog(QDialog):
 
     def update_order_details(self, new_order_details: dict):
         self.order_details = new_order_details
+        self._option_name, self._option_type_char = self._resolve_option_type(new_order_details)
         self._repopulate_strikes_list()
         self._update_cost_summary()
         logger.info("Order confirmation dialog refreshed with latest prices.")
@@ -102,7 +103,7 @@ class OrderConfirmationDialog(QDialog):
     def _update_cost_summary(self):
         cost_value = self.cost_summary_widget.findChild(QLabel, "costValue")
         total_premium = int(self.order_details.get('total_premium_estimate', 0.0))
-        formatted_value = locale.format_string("%d", total_premium, grouping=True)
+        formatted_value = format_inr(total_premium)
         cost_value.setText(f"₹ {formatted_value}")
 
     def _create_strikes_list_widget(self):
@@ -167,8 +168,7 @@ class OrderConfirmationDialog(QDialog):
         buy_tag = self._create_tag_label("BUY", "buyTag")
         tags_layout.addWidget(buy_tag)
 
-        option_type_val = od.get("option_type")
-        option_name = option_type_val.name if hasattr(option_type_val, 'name') else str(option_type_val)
+        option_name = self._option_name
         tag_object_name = "callTag" if "CALL" in option_name.upper() else "putTag"
         option_tag = self._create_tag_label(option_name, tag_object_name)
         tags_layout.addWidget(option_tag)
@@ -191,10 +191,7 @@ class OrderConfirmationDialog(QDialog):
         strike_layout.setContentsMargins(10, 8, 10, 8)
 
         strike_price = strike_info.get("strike", 0)
-        option_type_val = self.order_details.get("option_type")
-        option_type_char = (
-            option_type_val.name[0] if hasattr(option_type_val, 'name') else str(option_type_val)[0]).upper()
-        strike_label = QLabel(f"{strike_price:.0f}{option_type_char}E")
+        strike_label = QLabel(f"{strike_price:.0f}{self._option_type_char}E")
         strike_label.setObjectName("strikePriceLabel")
 
         ltp_label = QLabel(f"₹{strike_info.get('ltp', 0.0):.2f}")
@@ -214,7 +211,7 @@ class OrderConfirmationDialog(QDialog):
         layout.setContentsMargins(15, 12, 15, 12)
 
         cost_int = int(od.get('total_premium_estimate', 0.0))
-        formatted_cost = locale.format_string("%d", cost_int, grouping=True)
+        formatted_cost = format_inr(cost_int)
         cost_value = QLabel(f"₹ {formatted_cost}")
         cost_value.setObjectName("costValue")
         cost_value.setAlignment(Qt.AlignCenter)
@@ -227,6 +224,13 @@ class OrderConfirmationDialog(QDialog):
         layout.addWidget(title)
         return self.cost_summary_widget
 
+    @staticmethod
+    def _resolve_option_type(order_details: dict) -> tuple:
+        """Resolves the option type display name and its leading char once per refresh."""
+        option_type_val = order_details.get("option_type")
+        option_name = option_type_val.name if hasattr(option_type_val, 'name') else str(option_type_val)
+        return option_name, option_name[:1].upper()
+
     @staticmethod
     def _create_tag_label(text, object_name):
         label = QLabel(text)
@@ -1,19 +1,104 @@
+import importlib.util
 import logging
-from datetime import datetime
 
+import numpy as np
 import pyqtgraph as pg
 from pyqtgraph import DateAxisItem
-from PySide6.QtCore import Qt, Signal, QPoint
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, Signal, QPointF, QTimer
+from PySide6.QtGui import QFont, QShowEvent
 from PySide6.QtWidgets import (
     QDialog, QWidget, QLabel, QPushButton,
     QVBoxLayout, QHBoxLayout, QGridLayout
 )
 
+from utils.metrics_kernels import reduce_pnl
 from utils.pnl_logger import PnlLogger
 
 logger = logging.getLogger(__name__)
 
+# Metric value palette
+COLOR_PROFIT = "#4CAF50"
+COLOR_LOSS = "#F85149"
+COLOR_ACCENT = "#29C7C9"
+COLOR_EDGE = "#00D1B2"
+COLOR_WARN = "#F39C12"
+COLOR_NEUTRAL = "#E0E0E0"
+
+# Metric value format templates
+_FMT_INR = "₹{:,.0f}"
+_FMT_PCT = "{:.1f}%"
+_FMT_RATIO = "{:.2f}"
+
+_STYLE = """
+    QToolTip {
+        background-color: #212635;
+        color: #E0E0E0;
+        border: 1px solid #3A4458;
+        border-radius: 6px;
+        padding: 6px 8px;
+        font-size: 11px;
+    }
+    #mainContainer {
+        background-color: #161A25;
+        border: 1px solid #3A4458;
+        border-radius: 14px;
+    }
+    #dialogTitle {
+        color: #FFFFFF;
+        font-size: 18px;
+        font-weight: 600;
+    }
+    #modeBadge {
+        background-color: #212635;
+        border: 1px solid #3A4458;
+        border-radius: 6px;
+        padding: 4px 10px;
+        color: #29C7C9;
+        font-size: 11px;
+        font-weight: bold;
+    }
+    #metricCard {
+        background-color: #212635;
+        border: 1px solid #3A4458;
+        border-radius: 10px;
+    }
+    #metricTitle {
+        color: #A9B1C3;
+        font-size: 11px;
+    }
+    #metricValue {
+        color: #FFFFFF;
+    }
+    #closeButton {
+        background: transparent;
+        border: none;
+        color: #8A9BA8;
+        font-size: 16px;
+    }
+    #closeButton:hover {
+        color: #FFFFFF;
+    }
+    QPushButton#navButton {
+        background-color: #212635;
+        border: 1px solid #3A4458;
+        border-radius: 6px;
+        padding: 6px 14px;
+        color: #E0E0E0;
+    }
+    QPushButton#navButton:hover {
+        background-color: #29C7C9;
+        color: #161A25;
+    }
+"""
+
+_COLOR_STYLES = {
+    color: f"color:{color};"
+    for color in (COLOR_PROFIT, COLOR_LOSS, COLOR_ACCENT, COLOR_EDGE, COLOR_WARN, COLOR_NEUTRAL)
+}
+
+# PyOpenGL backs pyqtgraph's GL viewport; only check it is installed, don't import it
+_HAS_OPENGL = importlib.util.find_spec("OpenGL") is not None
+
 
 class PerformanceDialog(QDialog):
     """
@@ -40,7 +125,8 @@ class PerformanceDialog(QDialog):
         "total_trades": "Total number of completed trades.",
         "consistency": "Percentage of days that ended in profit.\nMeasures stability, not accuracy.",
         "best_day": "Highest profit achieved in a single trading day.",
-        "worst_day": "Largest loss incurred in a single trading day."
+        "worst_day": "Largest loss incurred in a single trading day.",
+        "max_drawdown": "Largest peak-to-trough decline of the cumulative P&L curve."
     }
 
     # ------------------------------------------------------------------
@@ -50,7 +136,24 @@ class PerformanceDialog(QDialog):
 
         self.mode = mode.lower()
         self.pnl_logger = PnlLogger(mode=self.mode)
-        self._drag_pos: QPoint | None = None
+        self._drag_pos: QPointF | None = None
+
+        # Memoized state of the last rendered P&L snapshot
+        self._last_pnl_hash: int | None = None
+        self._metric_state: dict[str, tuple[str, str]] = {}
+
+        # Growable equity buffers; only the changed tail is recomputed per refresh
+        self._n_points = 0
+        self._xs_buf = np.empty(0)
+        self._vals_buf = np.empty(0)
+        self._ys_buf = np.empty(0)
+        self._peak_buf = np.empty(0)
+
+        # Coalesces bursts of refresh requests into a single pipeline run
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(50)
+        self._refresh_timer.timeout.connect(self._do_refresh)
 
         self.setWindowTitle("Performance Dashboard")
         self.setMinimumSize(1000, 720)
@@ -61,7 +164,14 @@ class PerformanceDialog(QDialog):
         self._connect_signals()
         self._apply_styles()
 
-        self.refresh()
+        # Data is loaded on first show, not at construction
+        self._initial_refresh_done = False
+
+    def showEvent(self, event: QShowEvent):
+        super().showEvent(event)
+        if not self._initial_refresh_done:
+            self._initial_refresh_done = True
+            self.refresh()
 
     # ------------------------------------------------------------------
     # UI
@@ -112,30 +222,27 @@ class PerformanceDialog(QDialog):
 
         self.labels = {}
 
-        metrics = [
-            ("Total P&L", "total_pnl"),
-            ("Expectancy", "expectancy"),
-            ("Win Rate", "win_rate"),
-            ("Profit Factor", "profit_factor"),
-
-            ("Avg Win", "avg_win"),
-            ("Avg Loss", "avg_loss"),
-            ("Risk–Reward", "rr_ratio"),
-            ("RR Quality", "rr_quality"),
-
-            ("Total Trades", "total_trades"),
-            ("Consistency", "consistency"),
-            ("Best Day", "best_day"),
-            ("Worst Day", "worst_day"),
+        metric_rows = [
+            [("Total P&L", "total_pnl"), ("Expectancy", "expectancy"),
+             ("Win Rate", "win_rate"), ("Profit Factor", "profit_factor")],
+            [("Avg Win", "avg_win"), ("Avg Loss", "avg_loss"),
+             ("Risk–Reward", "rr_ratio"), ("RR Quality", "rr_quality")],
+            [("Total Trades", "total_trades"), ("Consistency", "consistency"),
+             ("Best Day", "best_day"), ("Worst Day", "worst_day"), ("Max Drawdown", "max_drawdown")],
         ]
 
-        for i, (title, key) in enumerate(metrics):
-            row, col = divmod(i, 4)
-            self.labels[key] = self._metric_card(grid, title, key, row, col)
+        # Rows hold 4 or 5 cards; 20 equal columns let either fill the width evenly
+        columns = 20
+        for col in range(columns):
+            grid.setColumnStretch(col, 1)
+        for row, cards in enumerate(metric_rows):
+            span = columns // len(cards)
+            for i, (title, key) in enumerate(cards):
+                self.labels[key] = self._metric_card(grid, title, key, row, i * span, span)
 
         return grid
 
-    def _metric_card(self, layout, title, metric_key, row, col):
+    def _metric_card(self, layout, title, metric_key, row, col, col_span=1):
         card = QWidget()
         card.setObjectName("metricCard")
 
@@ -153,13 +260,15 @@ class PerformanceDialog(QDialog):
 
         value_lbl = QLabel("—")
         value_lbl.setObjectName("metricValue")
+        # Values are never rich text; skip Qt's per-setText HTML detection
+        value_lbl.setTextFormat(Qt.PlainText)
         value_lbl.setAlignment(Qt.AlignCenter)
         value_lbl.setFont(QFont("Segoe UI", 15, QFont.Weight.Bold))
 
         v.addWidget(title_lbl)
         v.addWidget(value_lbl)
 
-        layout.addWidget(card, row, col)
+        layout.addWidget(card, row, col, 1, col_span)
         return value_lbl
 
     # ------------------------------------------------------------------
@@ -167,7 +276,8 @@ class PerformanceDialog(QDialog):
     # ------------------------------------------------------------------
 
     def _create_chart(self):
-        axis = DateAxisItem(orientation="bottom")
+        # Equity points are UTC-midnight epochs, so render the axis in UTC too
+        axis = DateAxisItem(orientation="bottom", utcOffset=0)
         chart = pg.PlotWidget(axisItems={"bottom": axis})
         chart.setBackground("#161A25")
         chart.showGrid(x=True, y=True, alpha=0.25)
@@ -179,6 +289,37 @@ class PerformanceDialog(QDialog):
             minor=86400
         )
 
+        # Pens/brushes are built once and shared by the persistent items
+        self._pen_equity = pg.mkPen("#9ADFE0", width=1.6)
+        self._pen_zero = pg.mkPen("#3A4458", style=Qt.DashLine)
+        self._brush_pos = pg.mkBrush(41, 199, 201, 55)
+        self._brush_neg = pg.mkBrush(248, 81, 73, 55)
+        self._brush_dd = pg.mkBrush(248, 81, 73, 35)
+
+        # Persistent items — refreshed via setData() instead of clear() + plot()
+        self._zero_line = pg.InfiniteLine(pos=0, angle=0, pen=self._pen_zero)
+        # Antialias only the thin equity line; the translucent fills don't need it
+        self._equity_curve = pg.PlotDataItem(pen=self._pen_equity, antialias=True)
+        self._pos_fill = pg.PlotDataItem(pen=None, fillLevel=0, fillBrush=self._brush_pos, antialias=False)
+        self._neg_fill = pg.PlotDataItem(pen=None, fillLevel=0, fillBrush=self._brush_neg, antialias=False)
+
+        # Invisible running-peak curve; the drawdown band is filled between it and the equity line
+        self._peak_curve = pg.PlotDataItem(pen=None, antialias=False)
+        self._dd_fill = pg.FillBetweenItem(self._peak_curve, self._equity_curve, brush=self._brush_dd)
+
+        for item in (self._equity_curve, self._peak_curve, self._pos_fill, self._neg_fill):
+            # Peak downsampling keeps extremes visible while long histories stay cheap to draw
+            item.setDownsampling(auto=True, method="peak")
+            item.setClipToView(True)
+
+        for item in (self._zero_line, self._peak_curve, self._dd_fill,
+                     self._equity_curve, self._pos_fill, self._neg_fill):
+            chart.addItem(item)
+        self._zero_line.setVisible(False)
+
+        if _HAS_OPENGL:
+            chart.useOpenGL(True)
+
         self.chart = chart
         return chart
 
@@ -187,29 +328,46 @@ class PerformanceDialog(QDialog):
     # ------------------------------------------------------------------
 
     def refresh(self):
+        # Restarting an active single-shot timer folds this call into the pending one
+        self._refresh_timer.start()
+
+    def _do_refresh(self):
         pnl = self.pnl_logger.get_all_pnl()
-        self._update_metrics(pnl)
-        self._plot_equity(pnl)
 
-    def _update_metrics(self, pnl: dict):
-        if not pnl:
+        # ISO date keys sort chronologically, so this order serves the chart as well
+        items = sorted(pnl.items())
+
+        # Skip metrics + re-plot entirely when the history is unchanged
+        pnl_hash = hash(tuple(items))
+        if pnl_hash == self._last_pnl_hash:
+            return
+        self._last_pnl_hash = pnl_hash
+
+        # Pack the rows once into parallel arrays shared by the metrics and the chart
+        dates = np.array([d for d, _ in items], dtype="datetime64[s]")
+        vals = np.fromiter((p for _, p in items), dtype=np.float64, count=len(items))
+
+        self._update_metrics(vals)
+        self._plot_equity(dates, vals)
+
+    def _update_metrics(self, vals: np.ndarray):
+        if not vals.size:
+            self._reset_metrics()
             return
 
-        values = list(pnl.values())
-        wins = [v for v in values if v > 0]
-        losses = [v for v in values if v < 0]
+        stats = reduce_pnl(vals)
 
-        total = len(values)
-        total_pnl = sum(values)
-        win_rate = (len(wins) / total) * 100 if total else 0
+        total = stats.count
+        total_pnl = stats.total
+        win_rate = (stats.pos_count / total) * 100 if total else 0
 
-        avg_win = sum(wins) / len(wins) if wins else 0
-        avg_loss = abs(sum(losses) / len(losses)) if losses else 0
+        avg_win = stats.pos_sum / stats.pos_count if stats.pos_count else 0
+        avg_loss = abs(stats.neg_sum / stats.neg_count) if stats.neg_count else 0
 
         rr = avg_win / avg_loss if avg_loss else 0
         expectancy = (win_rate / 100) * avg_win - ((100 - win_rate) / 100) * avg_loss
-        profit_factor = sum(wins) / abs(sum(losses)) if losses else float("inf")
-        consistency = (len(wins) / total) * 100 if total else 0
+        profit_factor = stats.pos_sum / abs(stats.neg_sum) if stats.neg_count else float("inf")
+        consistency = (stats.pos_count / total) * 100 if total else 0
 
         rr_quality = (
             "Poor" if rr < 1 else
@@ -218,61 +376,101 @@ class PerformanceDialog(QDialog):
             "Very Good"
         )
 
-        def setv(key, text, color):
+        setv = self._set_metric
+
+        # Defer repaints until every card is updated; re-enabling schedules a single repaint
+        self.container.setUpdatesEnabled(False)
+        try:
+            setv("total_pnl", _FMT_INR.format(total_pnl), COLOR_ACCENT if total_pnl >= 0 else COLOR_LOSS)
+            setv("expectancy", _FMT_INR.format(expectancy), COLOR_EDGE if expectancy >= 0 else COLOR_LOSS)
+            setv("win_rate", _FMT_PCT.format(win_rate), COLOR_PROFIT if win_rate >= 50 else COLOR_WARN)
+            setv("profit_factor", _FMT_RATIO.format(profit_factor), COLOR_PROFIT if profit_factor >= 1.5 else COLOR_WARN)
+
+            setv("avg_win", _FMT_INR.format(avg_win), COLOR_PROFIT)
+            setv("avg_loss", _FMT_INR.format(avg_loss), COLOR_LOSS)
+            setv("rr_ratio", _FMT_RATIO.format(rr), COLOR_ACCENT)
+            setv("rr_quality", rr_quality,
+                 COLOR_EDGE if rr >= 2 else COLOR_ACCENT if rr >= 1.5 else COLOR_WARN)
+
+            setv("total_trades", str(total), COLOR_NEUTRAL)
+            setv("consistency", _FMT_PCT.format(consistency), COLOR_PROFIT if consistency >= 50 else COLOR_WARN)
+            setv("best_day", _FMT_INR.format(stats.best), COLOR_PROFIT)
+            setv("worst_day", _FMT_INR.format(stats.worst), COLOR_LOSS)
+        finally:
+            self.container.setUpdatesEnabled(True)
+
+    def _reset_metrics(self):
+        """Returns every card, max drawdown included, to its "—" placeholder."""
+        for key in self._metric_state:
             lbl = self.labels[key]
-            lbl.setText(text)
-            lbl.setStyleSheet(f"color:{color};")
-
-        setv("total_pnl", f"₹{total_pnl:,.0f}", "#29C7C9" if total_pnl >= 0 else "#F85149")
-        setv("expectancy", f"₹{expectancy:,.0f}", "#00D1B2" if expectancy >= 0 else "#F85149")
-        setv("win_rate", f"{win_rate:.1f}%", "#4CAF50" if win_rate >= 50 else "#F39C12")
-        setv("profit_factor", f"{profit_factor:.2f}", "#4CAF50" if profit_factor >= 1.5 else "#F39C12")
-
-        setv("avg_win", f"₹{avg_win:,.0f}", "#4CAF50")
-        setv("avg_loss", f"₹{avg_loss:,.0f}", "#F85149")
-        setv("rr_ratio", f"{rr:.2f}", "#29C7C9")
-        setv("rr_quality", rr_quality,
-             "#00D1B2" if rr >= 2 else "#29C7C9" if rr >= 1.5 else "#F39C12")
-
-        setv("total_trades", str(total), "#E0E0E0")
-        setv("consistency", f"{consistency:.1f}%", "#4CAF50" if consistency >= 50 else "#F39C12")
-        setv("best_day", f"₹{max(values):,.0f}", "#4CAF50")
-        setv("worst_day", f"₹{min(values):,.0f}", "#F85149")
-
-    def _plot_equity(self, pnl: dict):
-        self.chart.clear()
+            lbl.setText("—")
+            lbl.setStyleSheet("")
+        self._metric_state.clear()
 
-        xs, ys = [], []
-        running = 0.0
-
-        for d, p in sorted(pnl.items()):
-            running += p
-            xs.append(datetime.strptime(d, "%Y-%m-%d").timestamp())
-            ys.append(running)
-
-        if not xs:
+    def _set_metric(self, key, text, color):
+        prev = self._metric_state.get(key)
+        if prev == (text, color):
             return
-
-        # Zero line
-        self.chart.addItem(
-            pg.InfiniteLine(pos=0, angle=0, pen=pg.mkPen("#3A4458", style=Qt.DashLine))
-        )
+        lbl = self.labels[key]
+        if prev is None or prev[0] != text:
+            lbl.setText(text)
+        # Re-parsing the style sheet dominates the per-label cost
+        if prev is None or prev[1] != color:
+            lbl.setStyleSheet(_COLOR_STYLES[color])
+        self._metric_state[key] = (text, color)
+
+    def _ensure_capacity(self, n: int):
+        cap = self._xs_buf.size
+        if n <= cap:
+            return
+        new_cap = max(n, 2 * cap, 64)
+        for name in ("_xs_buf", "_vals_buf", "_ys_buf", "_peak_buf"):
+            buf = np.empty(new_cap)
+            buf[:cap] = getattr(self, name)
+            setattr(self, name, buf)
+
+    def _plot_equity(self, dates: np.ndarray, vals: np.ndarray):
+        # Inputs arrive date-sorted; ISO dates parse natively as datetime64 — no per-row strptime
+        n = vals.size
+        xs_new = dates.astype(np.int64).astype(np.float64)
+
+        # Typically only today's value changes or a new day is appended:
+        # keep the cached cumulative series up to the first differing day
+        m = min(n, self._n_points)
+        changed = np.flatnonzero((self._xs_buf[:m] != xs_new[:m]) | (self._vals_buf[:m] != vals[:m]))
+        start = int(changed[0]) if changed.size else m
+
+        self._ensure_capacity(n)
+        self._xs_buf[start:n] = xs_new[start:]
+        self._vals_buf[start:n] = vals[start:]
+
+        base = self._ys_buf[start - 1] if start else 0.0
+        self._ys_buf[start:n] = base + np.cumsum(vals[start:])
+
+        # The curve starts from 0, so a losing first day already counts as drawdown
+        peak_tail = np.maximum.accumulate(self._ys_buf[start:n])
+        np.maximum(peak_tail, self._peak_buf[start - 1] if start else 0.0, out=peak_tail)
+        self._peak_buf[start:n] = peak_tail
+        self._n_points = n
+
+        xs = self._xs_buf[:n]
+        ys = self._ys_buf[:n]
+        peak = self._peak_buf[:n]
+
+        # Drawdown from the running peak, reusing the cumulative series
+        if ys.size:
+            max_dd = float((peak - ys).max())
+            self._set_metric("max_drawdown", _FMT_INR.format(max_dd), COLOR_LOSS)
+
+        self._zero_line.setVisible(bool(xs.size))
+        self._peak_curve.setData(xs, peak)
 
         # Main soft equity line
-        self.chart.plot(
-            xs, ys,
-            pen=pg.mkPen("#9ADFE0", width=1.6),
-            antialias=True
-        )
+        self._equity_curve.setData(xs, ys)
 
         # Area fills
-        self.chart.plot(xs, [y if y > 0 else 0 for y in ys],
-                        pen=None, fillLevel=0,
-                        fillBrush=pg.mkBrush(41, 199, 201, 55))
-
-        self.chart.plot(xs, [y if y < 0 else 0 for y in ys],
-                        pen=None, fillLevel=0,
-                        fillBrush=pg.mkBrush(248, 81, 73, 55))
+        self._pos_fill.setData(xs, np.maximum(ys, 0.0))
+        self._neg_fill.setData(xs, np.minimum(ys, 0.0))
 
     # ------------------------------------------------------------------
     # DRAG SUPPORT
@@ -280,13 +478,15 @@ class PerformanceDialog(QDialog):
 
     def mousePressEvent(self, e):
         if e.button() == Qt.LeftButton:
-            self._drag_pos = e.globalPosition().toPoint()
+            # Cursor offset from the window origin, kept in float coordinates
+            self._drag_pos = e.globalPosition() - QPointF(self.pos())
 
     def mouseMoveEvent(self, e):
-        if self._drag_pos:
-            delta = e.globalPosition().toPoint() - self._drag_pos
-            self.move(self.pos() + delta)
-            self._drag_pos = e.globalPosition().toPoint()
+        drag_pos = self._drag_pos
+        if drag_pos is None:
+            return
+        # Single float->int conversion per event; the offset itself never drifts
+        self.move((e.globalPosition() - drag_pos).toPoint())
 
     def mouseReleaseEvent(self, e):
         self._drag_pos = None
@@ -300,64 +500,4 @@ class PerformanceDialog(QDialog):
         self.close_btn.clicked.connect(self.close)
 
     def _apply_styles(self):
-        self.setStyleSheet("""
-            QToolTip {
-                background-color: #212635;
-                color: #E0E0E0;
-                border: 1px solid #3A4458;
-                border-radius: 6px;
-                padding: 6px 8px;
-                font-size: 11px;
-            }
-            #mainContainer {
-                background-color: #161A25;
-                border: 1px solid #3A4458;
-                border-radius: 14px;
-            }
-            #dialogTitle {
-                color: #FFFFFF;
-                font-size: 18px;
-                font-weight: 600;
-            }
-            #modeBadge {
-                background-color: #212635;
-                border: 1px solid #3A4458;
-                border-radius: 6px;
-                padding: 4px 10px;
-                color: #29C7C9;
-                font-size: 11px;
-                font-weight: bold;
-            }
-            #metricCard {
-                background-color: #212635;
-                border: 1px solid #3A4458;
-                border-radius: 10px;
-            }
-            #metricTitle {
-                color: #A9B1C3;
-                font-size: 11px;
-            }
-            #metricValue {
-                color: #FFFFFF;
-            }
-            #closeButton {
-                background: transparent;
-                border: none;
-                color: #8A9BA8;
-                font-size: 16px;
-            }
-            #closeButton:hover {
-                color: #FFFFFF;
-            }
-            QPushButton#navButton {
-                background-color: #212635;
-                border: 1px solid #3A4458;
-                border-radius: 6px;
-                padding: 6px 14px;
-                color: #E0E0E0;
-            }
-            QPushButton#navButton:hover {
-                background-color: #29C7C9;
-                color: #161A25;
-            }
-        """)
+        self.setStyleSheet(_STYLE)
@@ -1,15 +1,93 @@
 # dialogs/pnl_history_dialog.py
 import logging
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import date
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QWidget, QHeaderView, QAbstractItemView
+    QTableWidget, QTableWidgetItem, QWidget, QHeaderView, QAbstractItemView,
+    QStyledItemDelegate
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtGui import QBrush, QColor, QPainter
 from utils.pnl_logger import PnlLogger
 
 logger = logging.getLogger(__name__)
 
+_EMPTY: dict = {}
+
+# Number of recently viewed months whose cell data is kept
+_MONTH_CACHE_SIZE = 4
+
+# Day-of-month labels, indexed by day number (index 0 unused)
+_DAY_STRS = tuple(str(i) for i in range(32))
+
+_PROFIT_COLOR = QColor("#29C7C9")
+_LOSS_COLOR = QColor("#F85149")
+_DAY_COLOR = QColor("#A9B1C3")
+_DIM_COLOR = QColor("#4A5568")
+_BORDER_COLOR = QColor("#2A3140")
+_TRADE_DAY_BRUSH = QBrush(QColor("#212635"))
+
+# Month total colour; a palette isn't guaranteed to apply under the container's style sheet
+_PROFIT_TOTAL_STYLE = f"color: {_PROFIT_COLOR.name()};"
+_LOSS_TOTAL_STYLE = f"color: {_LOSS_COLOR.name()};"
+
+# Item data roles carrying calendar cell state
+PNL_ROLE = Qt.UserRole
+IS_CURRENT_ROLE = Qt.UserRole + 1
+
+
+def _update_calendar_cell(item: QTableWidgetItem, day_num: int, pnl: float, is_current_month: bool):
+    item.setData(PNL_ROLE, pnl)
+    item.setData(IS_CURRENT_ROLE, is_current_month)
+
+    if pnl is not None and is_current_month:
+        item.setData(Qt.DisplayRole, f"{_DAY_STRS[day_num]}\n₹{pnl:,.0f}")
+    else:
+        item.setData(Qt.DisplayRole, _DAY_STRS[day_num])
+
+
+class PnlCellDelegate(QStyledItemDelegate):
+    """
+    Paints calendar cells straight from their item roles, so month changes
+    only touch item data and never re-resolve per-item stylesheets.
+    """
+
+    def paint(self, painter, option, index):
+        pnl = index.data(PNL_ROLE)
+        is_current = index.data(IS_CURRENT_ROLE)
+        is_trade_day = pnl is not None and is_current
+        rect = option.rect.adjusted(1, 1, -1, -1)
+
+        if is_trade_day:
+            text_color = _PROFIT_COLOR if pnl >= 0 else _LOSS_COLOR
+        else:
+            text_color = _DAY_COLOR if is_current else _DIM_COLOR
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(_BORDER_COLOR)
+        painter.setBrush(_TRADE_DAY_BRUSH if is_trade_day else Qt.NoBrush)
+        painter.drawRoundedRect(rect, 4, 4)
+
+        painter.setFont(option.font)
+        painter.setPen(text_color)
+        painter.drawText(rect.adjusted(10, 8, -10, -8), Qt.AlignTop | Qt.AlignLeft, index.data())
+        painter.restore()
+
+
+class PnlLoadWorker(QThread):
+    """Background thread that reads the full P&L history from the logger."""
+
+    pnl_loaded = Signal(dict)
+
+    def __init__(self, pnl_logger: PnlLogger, parent=None):
+        super().__init__(parent)
+        self.pnl_logger = pnl_logger
+
+    def run(self):
+        self.pnl_loaded.emit(self.pnl_logger.get_all_pnl())
+
 
 class PnlHistoryDialog(QDialog):
     """
@@ -17,17 +95,78 @@ class PnlHistoryDialog(QDialog):
     with the application's consistent rich and modern dark theme.
     """
 
+    _STYLESHEET = """
+            #mainContainer {
+                background-color: #161A25;
+                border: 1px solid #3A4458;
+                border-radius: 12px;
+                font-family: "Segoe UI", sans-serif;
+            }
+            #monthYearLabel { color: #FFFFFF; font-size: 20px; font-weight: 300; }
+            #totalPnlLabel { font-size: 18px; font-weight: 600; }
+            #closeButton, #navButton {
+                background-color: #212635; color: #A9B1C3; border: none;
+                font-family: "Segoe UI Symbol"; font-size: 16px;
+                border-radius: 6px; min-width: 36px; min-height: 36px;
+            }
+            #closeButton:hover, #navButton:hover { background-color: #3A4458; color: #FFFFFF; }
+
+            QTableWidget {
+                background-color: transparent; border: none;
+                font-size: 14px; font-weight: 600;
+            }
+            QHeaderView::section {
+                background-color: transparent; color: #8A9BA8;
+                padding: 10px 0px; border: none;
+                border-bottom: 1px solid #2A3140;
+                font-weight: bold; font-size: 11px; text-transform: uppercase;
+            }
+        """
+
     def __init__(self, mode: str = 'live', parent=None):
         super().__init__(parent)
         self.pnl_logger = PnlLogger(mode=mode)
-        self.pnl_data = self.pnl_logger.get_all_pnl()
-        self.current_date = datetime.today()
+        self.pnl_data = {}
+        self._pnl_by_ym = {}
+        today = date.today()
+        self._year, self._month = today.year, today.month
+        self._last_rendered_ym = None
+        self._month_cache = OrderedDict()
+        self._total_pnl_style = None
         self._drag_pos = None
 
         self._setup_window()
         self._setup_ui()
         self._apply_styles()
         self._populate_calendar()
+        self._start_pnl_load()
+
+    def _start_pnl_load(self):
+        """Renders the empty calendar immediately and fills it once the history is read."""
+        self.total_pnl_label.setText("Loading…")
+        self._pnl_loader = PnlLoadWorker(self.pnl_logger, self)
+        self._pnl_loader.pnl_loaded.connect(self._on_pnl_loaded)
+        self._pnl_loader.finished.connect(self._on_pnl_loader_finished)
+        self._pnl_loader.finished.connect(self._pnl_loader.deleteLater)
+        self._pnl_loader.start()
+
+    def _on_pnl_loader_finished(self):
+        # The thread is about to be deleteLater'd; done() must not touch it after this
+        self._pnl_loader = None
+
+    def _on_pnl_loaded(self, pnl_data: dict):
+        self.pnl_data = pnl_data
+        self._pnl_by_ym = self._bucket_by_month(pnl_data)
+        self._month_cache.clear()
+        self._last_rendered_ym = None
+        self._populate_calendar()
+
+    def done(self, result):
+        # close() also lands here; the loader is parented to the dialog, so it
+        # must finish before the dialog (and with it the QThread) can be destroyed
+        if self._pnl_loader is not None:
+            self._pnl_loader.wait()
+        super().done(result)
 
     def _setup_window(self):
         self.setWindowTitle("P&L History")
@@ -40,6 +179,7 @@ class PnlHistoryDialog(QDialog):
         # Main container for rounded corners and background
         container = QWidget(self)
         container.setObjectName("mainContainer")
+        self._container = container
 
         container_layout = QVBoxLayout(container)
         container_layout.setContentsMargins(20, 10, 20, 20)
@@ -53,6 +193,13 @@ class PnlHistoryDialog(QDialog):
         self.calendar_table = self._create_calendar_table()
         container_layout.addWidget(self.calendar_table, 1)
 
+        # 42 resident cells, mutated in place on every month change
+        self._cells = [[QTableWidgetItem() for _ in range(7)] for _ in range(6)]
+        for row, cells in enumerate(self._cells):
+            for col, item in enumerate(cells):
+                self.calendar_table.setItem(row, col, item)
+        self._cell_items = [item for cells in self._cells for item in cells]
+
     def _create_header(self):
         header_layout = QHBoxLayout()
         header_layout.setContentsMargins(0, 0, 0, 0)
@@ -96,115 +243,91 @@ class PnlHistoryDialog(QDialog):
         table.setFocusPolicy(Qt.NoFocus)
         table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
         table.setShowGrid(False)
+        table.setItemDelegate(PnlCellDelegate(table))
         return table
 
+    @staticmethod
+    def _bucket_by_month(pnl_data: dict) -> dict:
+        """Indexes 'YYYY-MM-DD' keyed P&L as {(year, month): {day: pnl}}."""
+        buckets = {}
+        for date_key, pnl in pnl_data.items():
+            y, m, d = date_key.split('-')
+            buckets.setdefault((int(y), int(m)), {})[int(d)] = pnl
+        return buckets
+
     def _navigate_months(self, offset: int):
-        month = self.current_date.month - 1 + offset
-        year = self.current_date.year + month // 12
-        month = month % 12 + 1
-        self.current_date = datetime(year, month, 1)
+        if offset == 0:
+            return
+        month = self._month - 1 + offset
+        self._year += month // 12
+        self._month = month % 12 + 1
         self._populate_calendar()
 
     def _populate_calendar(self):
-        self.month_year_label.setText(self.current_date.strftime('%B %Y').upper())
-        self.calendar_table.clearContents()
-
-        year, month = self.current_date.year, self.current_date.month
-        first_day_of_month = datetime(year, month, 1)
-        start_day_of_calendar = first_day_of_month - timedelta(days=(first_day_of_month.weekday() + 1) % 7)
-
-        month_total_pnl = 0.0
-
-        for row in range(6):
-            for col in range(7):
-                day = start_day_of_calendar + timedelta(days=row * 7 + col)
-                date_key = day.strftime("%Y-%m-%d")
-                pnl = self.pnl_data.get(date_key)
-
-                cell_widget = self._create_calendar_cell(day, pnl, day.month == month)
-                self.calendar_table.setCellWidget(row, col, cell_widget)
-
-                if pnl is not None and day.month == month:
-                    month_total_pnl += pnl
+        key = (self._year, self._month)
+        if key == self._last_rendered_ym:
+            return
+        self._last_rendered_ym = key
+
+        year, month = key
+        self.month_year_label.setText(date(year, month, 1).strftime('%B %Y').upper())
+
+        cached = self._month_cache.get(key)
+        if cached is None:
+            cached = self._compute_month(year, month)
+            self._month_cache[key] = cached
+            if len(self._month_cache) > _MONTH_CACHE_SIZE:
+                self._month_cache.popitem(last=False)
+        else:
+            self._month_cache.move_to_end(key)
+        cells_data, month_total_pnl = cached
+
+        table = self.calendar_table
+        items = self._cell_items
+        update_cell = _update_calendar_cell
+
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        was_sorting = table.isSortingEnabled()
+        table.setSortingEnabled(False)
+        try:
+            for item, (day_num, pnl, is_cur) in zip(items, cells_data):
+                update_cell(item, day_num, pnl, is_cur)
+        finally:
+            table.setSortingEnabled(was_sorting)
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
 
         self.total_pnl_label.setText(f"Month P&L: ₹{month_total_pnl:,.2f}")
-        color = "#29C7C9" if month_total_pnl >= 0 else "#F85149"
-        self.total_pnl_label.setStyleSheet(f"color: {color};")
-        self.calendar_table.viewport().update()
-
-    @staticmethod
-    def _create_calendar_cell(day: datetime, pnl: float, is_current_month: bool) -> QWidget:
-        widget = QWidget()
-        widget.setObjectName("calendarCell")
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(10, 8, 10, 8)
-        layout.setSpacing(4)
-
-        day_label = QLabel(str(day.day))
-        day_label.setObjectName("dayLabel")
-        layout.addWidget(day_label)
-        layout.addStretch()
-
-        if pnl is not None and is_current_month:
-            pnl_label = QLabel(f"₹{pnl:,.0f}")
-            pnl_label.setObjectName("pnlLabel")
-            color = "#29C7C9" if pnl >= 0 else "#F85149"
-            pnl_label.setStyleSheet(f"color: {color};")
-            layout.addWidget(pnl_label)
-
-        # Style based on cell state
-        if not is_current_month:
-            widget.setProperty("isCurrentMonth", "false")
-        elif pnl is not None:
-            widget.setProperty("tradeDay", "true")
-            widget.setProperty("isProfit", "true" if pnl >= 0 else "false")
-
-        # Re-polish to apply property changes
-        widget.style().unpolish(widget)
-        widget.style().polish(widget)
-
-        return widget
+        style = _PROFIT_TOTAL_STYLE if month_total_pnl >= 0 else _LOSS_TOTAL_STYLE
+        if style is not self._total_pnl_style:
+            self._total_pnl_style = style
+            self.total_pnl_label.setStyleSheet(style)
+
+    def _compute_month(self, year: int, month: int):
+        """
+        Returns the month's 42 (day_number, pnl, is_current_month) entries,
+        Sunday-first, together with the month's total P&L.
+        """
+        first_day_of_month = date(year, month, 1)
+        base_ord = first_day_of_month.toordinal() - (first_day_of_month.weekday() + 1) % 7
+
+        bucket = self._pnl_by_ym.get((year, month), _EMPTY)
+        from_ordinal = date.fromordinal
+        cells_data = []
+        month_total_pnl = 0.0
+        for i in range(42):
+            d = from_ordinal(base_ord + i)
+            is_cur = d.month == month
+            p = bucket.get(d.day) if is_cur else None
+            if p is not None:
+                month_total_pnl += p
+            cells_data.append((d.day, p, is_cur))
+        return cells_data, month_total_pnl
 
     def _apply_styles(self):
         """Applies a premium, modern dark theme."""
-        self.setStyleSheet("""
-            #mainContainer {
-                background-color: #161A25;
-                border: 1px solid #3A4458;
-                border-radius: 12px;
-                font-family: "Segoe UI", sans-serif;
-            }
-            #monthYearLabel { color: #FFFFFF; font-size: 20px; font-weight: 300; }
-            #totalPnlLabel { font-size: 18px; font-weight: 600; }
-            #closeButton, #navButton {
-                background-color: #212635; color: #A9B1C3; border: none;
-                font-family: "Segoe UI Symbol"; font-size: 16px;
-                border-radius: 6px; min-width: 36px; min-height: 36px;
-            }
-            #closeButton:hover, #navButton:hover { background-color: #3A4458; color: #FFFFFF; }
-
-            QTableWidget { background-color: transparent; border: none; }
-            QHeaderView::section {
-                background-color: transparent; color: #8A9BA8;
-                padding: 10px 0px; border: none;
-                border-bottom: 1px solid #2A3140;
-                font-weight: bold; font-size: 11px; text-transform: uppercase;
-            }
-            #calendarCell {
-                background-color: transparent;
-                border: 1px solid #2A3140;
-                border-radius: 4px;
-            }
-            #calendarCell[isCurrentMonth="false"] { border: 1px solid transparent; }
-            #calendarCell[tradeDay="true"] { background-color: #212635; }
-            #calendarCell[isProfit="true"]:hover { border-color: #29C7C9; }
-            #calendarCell[isProfit="false"]:hover { border-color: #F85149; }
-
-            #dayLabel { font-size: 12px; font-weight: bold; color: #A9B1C3; }
-            #calendarCell[isCurrentMonth="false"] #dayLabel { color: #4A5568; }
-
-            #pnlLabel { font-size: 16px; font-weight: 600; }
-        """)
+        self._container.setStyleSheet(self._STYLESHEET)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
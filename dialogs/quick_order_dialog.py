@@ -1,24 +1,47 @@
 # dialogs/quick_order_dialog.py
 import logging
+import platform
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QDoubleSpinBox, QPushButton, QWidget, QFrame,
     QRadioButton, QAbstractSpinBox, QCheckBox
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QMouseEvent
+from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtGui import QMouseEvent, QCursor, QGuiApplication
+from kiteconnect import KiteConnect
 
 from utils.pricing_utils import calculate_smart_limit_price
 from utils.data_models import Contract, Position
-import locale
-
-try:
-    locale.setlocale(locale.LC_ALL, 'en_IN.UTF-8')
-except locale.Error:
-    locale.setlocale(locale.LC_ALL, '')
+from utils.formatters import format_inr
 
 logger = logging.getLogger(__name__)
 
+_BUY = KiteConnect.TRANSACTION_TYPE_BUY
+_SELL = KiteConnect.TRANSACTION_TYPE_SELL
+
+_IS_WINDOWS = platform.system() == "Windows"
+
+# (availableGeometry, devicePixelRatio) per QScreen, dropped when the screen changes or is removed
+_screen_cache = {}
+_screen_cache_hooked = False
+
+
+def _screen_info(screen):
+    global _screen_cache_hooked
+    if not _screen_cache_hooked:
+        QGuiApplication.instance().screenRemoved.connect(lambda s: _screen_cache.pop(id(s), None))
+        _screen_cache_hooked = True
+
+    key = id(screen)
+    info = _screen_cache.get(key)
+    if info is None:
+        info = (screen.availableGeometry(), screen.devicePixelRatio())
+        _screen_cache[key] = info
+        drop = lambda *_args, k=key: _screen_cache.pop(k, None)
+        screen.availableGeometryChanged.connect(drop)
+        screen.logicalDotsPerInchChanged.connect(drop)
+    return info
+
 
 class QuickOrderDialog(QDialog):
     """
@@ -28,9 +51,129 @@ class QuickOrderDialog(QDialog):
     order_placed = Signal(dict)
     refresh_requested = Signal(str)
 
+    _STYLESHEET = """
+            #mainContainer {
+                background-color: #161A25;
+                border: 1px solid #3A4458;
+                border-radius: 12px;
+                font-family: "Segoe UI", sans-serif;
+            }
+            #dialogTitle { color: #E0E0E0; font-size: 14px; font-weight: 600; }
+            #closeButton {
+                background-color: transparent; border: none; color: #8A9BA8;
+                font-size: 16px; font-weight: bold;
+            }
+            #closeButton:hover, #navButton:hover { background-color: #3A4458; color: #f52a20; }
+
+            #symbolLabel { color: #FFFFFF; font-size: 24px; font-weight: 300; }
+            #infoLabel { color: #A9B1C3; font-size: 12px; }
+            #divider { background-color: #2A3140; height: 1px; border: none; }
+            QLabel { color: #A9B1C3; font-size: 13px; }
+
+            QRadioButton { spacing: 8px; color: #A9B1C3; font-weight: bold; }
+            QRadioButton::indicator {
+                width: 18px; height: 18px; border-radius: 9px;
+                background-color: #2A3140; border: 1px solid #3A4458;
+            }
+            #buyRadio::indicator:checked { background-color: #29C7C9; border-color: #29C7C9; }
+            #sellRadio::indicator:checked { background-color: #F85149; border-color: #F85149; }
+
+            QCheckBox { color: #A9B1C3; spacing: 8px; font-weight: bold; }
+            QCheckBox::indicator {
+                width: 18px; height: 18px; border-radius: 4px;
+                background-color: #2A3140; border: 1px solid #3A4458;
+            }
+            QCheckBox::indicator:checked { background-color: #29C7C9; }
+
+            QDoubleSpinBox {
+                background-color: #212635; border: 1px solid #3A4458;
+                color: #E0E0E0; font-size: 14px; padding: 10px; border-radius: 6px;
+            }
+            QDoubleSpinBox:focus { border: 1px solid #29C7C9; }
+
+            #totalValueLabel {
+                color: #FFFFFF;
+                font-size: 18px;
+                font-weight: 500;
+            
+                /* FIX: prevent comma clipping */
+                padding: 10px 14px;
+            
+                /* FIX: improve numeric readability */
+            
+                background-color: #212635;
+                border-radius: 8px;
+            }
+
+            QPushButton {
+                font-weight: bold; border-radius: 6px; padding: 12px; font-size: 14px;
+            }
+            #secondaryButton {
+                background-color: #3A4458; color: #E0E0E0; border: none;
+            }
+            #secondaryButton:hover { background-color: #4A5568; }
+
+            #primaryButton { border: none; }
+            #primaryButton[transaction_type="BUY"] { background-color: #29C7C9; color: #161A25; }
+            #primaryButton[transaction_type="BUY"]:hover { background-color: #32E0E3; }
+            #primaryButton[transaction_type="SELL"] { background-color: #F85149; color: #161A25; }
+            #primaryButton[transaction_type="SELL"]:hover { background-color: #FA6B64; }
+        #infoLabel {
+                font-size: 12.5px;
+            }
+            
+            .badge {
+                padding: 4px 10px;
+                border-radius: 10px;
+                font-weight: 600;
+                letter-spacing: 0.3px;
+            }
+            
+            .badge.strike {
+                background-color: #1E2433;   /* calm blue-grey */
+                color: #A9B1C3;
+                border: 1px solid #2A3140;
+            }
+            
+            .badge.ltp {
+                background-color: rgba(41, 199, 201, 0.15); /* teal glow */
+                color: #29C7C9;
+                border: 1px solid rgba(41, 199, 201, 0.35);
+            }
+
+            /* Refresh button styling */
+        #refreshButton {
+            background-color: #3A4458; 
+            color: #E0E0E0; 
+            border: 1px solid #4A5568;
+        }
+        #refreshButton:hover { 
+            background-color: #4A5568; 
+            color: #FFFFFF;
+        }
+        #refreshButton:pressed {
+            background-color: #2A3140;
+        }
+
+        /* Confirm/Place Order button styling */
+        #confirmButton {
+            background-color: #29C7C9; 
+            color: #161A25;
+            font-weight: bold;
+        }
+        #confirmButton:hover { 
+            background-color: #32E0E3; 
+            color: #161A25;
+        }
+        #confirmButton:pressed {
+            background-color: #1FA8AA;
+        }
+        """
+
     def __init__(self, parent, contract: Contract, default_lots: int):
         super().__init__(parent)
         self.contract = contract
+        self._lot_size = contract.lot_size
         self._drag_pos = None
         self._last_ltp = None
 
@@ -51,9 +194,6 @@ class QuickOrderDialog(QDialog):
         self.setAttribute(Qt.WA_DeleteOnClose)
 
         # Windows-safe positioning
-        from PySide6.QtGui import QCursor, QGuiApplication
-        import platform
-
         cursor_pos = QCursor.pos()
         x_offset = 20
         y_offset = 10
@@ -63,7 +203,7 @@ class QuickOrderDialog(QDialog):
         if not screen:
             screen = QGuiApplication.primaryScreen()
 
-        screen_rect = screen.availableGeometry()
+        screen_rect, device_ratio = _screen_info(screen)
 
         # Get dialog size with fallback
         dialog_size = self.sizeHint()
@@ -75,11 +215,9 @@ class QuickOrderDialog(QDialog):
         y = cursor_pos.y() + y_offset
 
         # Windows-specific DPI handling
-        if platform.system() == "Windows":
-            device_ratio = screen.devicePixelRatio()
-            if device_ratio > 1.0:
-                x = int(x / device_ratio) * device_ratio
-                y = int(y / device_ratio) * device_ratio
+        if _IS_WINDOWS and device_ratio > 1.0:
+            x = int(x / device_ratio) * device_ratio
+            y = int(y / device_ratio) * device_ratio
 
         # Ensure dialog stays within screen bounds
         if x + dialog_size.width() > screen_rect.right():
@@ -94,8 +232,15 @@ class QuickOrderDialog(QDialog):
         self.move(int(x), int(y))
 
     def _setup_ui(self, default_lots):
+        # Coalesces bursts of valueChanged/toggled into one summary update
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(0)
+        self._update_timer.timeout.connect(self._do_update_summary)
+
         container = QWidget(self)
         container.setObjectName("mainContainer")
+        self._container = container
         container_layout = QVBoxLayout(container)
         container_layout.setContentsMargins(20, 10, 20, 20)
         container_layout.setSpacing(15)
@@ -229,7 +374,7 @@ class QuickOrderDialog(QDialog):
 
         self.lots_spinbox.valueChanged.connect(self._update_summary)
         self.price_spinbox.valueChanged.connect(self._update_summary)
-        self._update_summary()
+        self._do_update_summary()
         self.buy_radio.toggled.connect(self._update_summary)
         self.sell_radio.toggled.connect(self._update_summary)
 
@@ -252,8 +397,6 @@ class QuickOrderDialog(QDialog):
         Gathers order parameters, closes the dialog immediately, and then
         emits the signal for the main window to process the order.
         """
-        from kiteconnect import KiteConnect
-
         avg_price = self.price_spinbox.value()
         quantity = int(self.lots_spinbox.value()) * self.contract.lot_size
 
@@ -268,7 +411,7 @@ class QuickOrderDialog(QDialog):
             'quantity': quantity,
             'price': avg_price,
             'order_type': 'LIMIT',
-            'transaction_type': KiteConnect.TRANSACTION_TYPE_BUY if self.buy_radio.isChecked() else KiteConnect.TRANSACTION_TYPE_SELL,
+            'transaction_type': _BUY if self.buy_radio.isChecked() else _SELL,
             'stop_loss_price': stop_loss_price,
             'target_price': take_profit_price,
             'trailing_stop_loss': self.tsl_spinbox.value() if self.tsl_checkbox.isChecked() else 0,
@@ -279,134 +422,19 @@ class QuickOrderDialog(QDialog):
         self.order_placed.emit(order_parameters)
 
     def _apply_styles(self):
-        self.setStyleSheet("""
-            #mainContainer {
-                background-color: #161A25;
-                border: 1px solid #3A4458;
-                border-radius: 12px;
-                font-family: "Segoe UI", sans-serif;
-            }
-            #dialogTitle { color: #E0E0E0; font-size: 14px; font-weight: 600; }
-            #closeButton {
-                background-color: transparent; border: none; color: #8A9BA8;
-                font-size: 16px; font-weight: bold;
-            }
-            #closeButton:hover, #navButton:hover { background-color: #3A4458; color: #f52a20; }
-
-            #symbolLabel { color: #FFFFFF; font-size: 24px; font-weight: 300; }
-            #infoLabel { color: #A9B1C3; font-size: 12px; }
-            #divider { background-color: #2A3140; height: 1px; border: none; }
-            QLabel { color: #A9B1C3; font-size: 13px; }
-
-            QRadioButton { spacing: 8px; color: #A9B1C3; font-weight: bold; }
-            QRadioButton::indicator {
-                width: 18px; height: 18px; border-radius: 9px;
-                background-color: #2A3140; border: 1px solid #3A4458;
-            }
-            #buyRadio::indicator:checked { background-color: #29C7C9; border-color: #29C7C9; }
-            #sellRadio::indicator:checked { background-color: #F85149; border-color: #F85149; }
-
-            QCheckBox { color: #A9B1C3; spacing: 8px; font-weight: bold; }
-            QCheckBox::indicator {
-                width: 18px; height: 18px; border-radius: 4px;
-                background-color: #2A3140; border: 1px solid #3A4458;
-            }
-            QCheckBox::indicator:checked { background-color: #29C7C9; }
-
-            QDoubleSpinBox {
-                background-color: #212635; border: 1px solid #3A4458;
-                color: #E0E0E0; font-size: 14px; padding: 10px; border-radius: 6px;
-            }
-            QDoubleSpinBox:focus { border: 1px solid #29C7C9; }
-
-            #totalValueLabel {
-                color: #FFFFFF;
-                font-size: 18px;
-                font-weight: 500;
-            
-                /* FIX: prevent comma clipping */
-                padding: 10px 14px;
-            
-                /* FIX: improve numeric readability */
-            
-                background-color: #212635;
-                border-radius: 8px;
-            }
-
-            QPushButton {
-                font-weight: bold; border-radius: 6px; padding: 12px; font-size: 14px;
-            }
-            #secondaryButton {
-                background-color: #3A4458; color: #E0E0E0; border: none;
-            }
-            #secondaryButton:hover { background-color: #4A5568; }
-
-            #primaryButton { border: none; }
-            #primaryButton[transaction_type="BUY"] { background-color: #29C7C9; color: #161A25; }
-            #primaryButton[transaction_type="BUY"]:hover { background-color: #32E0E3; }
-            #primaryButton[transaction_type="SELL"] { background-color: #F85149; color: #161A25; }
-            #primaryButton[transaction_type="SELL"]:hover { background-color: #FA6B64; }
-        #infoLabel {
-                font-size: 12.5px;
-            }
-            
-            .badge {
-                padding: 4px 10px;
-                border-radius: 10px;
-                font-weight: 600;
-                letter-spacing: 0.3px;
-            }
-            
-            .badge.strike {
-                background-color: #1E2433;   /* calm blue-grey */
-                color: #A9B1C3;
-                border: 1px solid #2A3140;
-            }
-            
-            .badge.ltp {
-                background-color: rgba(41, 199, 201, 0.15); /* teal glow */
-                color: #29C7C9;
-                border: 1px solid rgba(41, 199, 201, 0.35);
-            }
-
-            /* Refresh button styling */
-        #refreshButton {
-            background-color: #3A4458; 
-            color: #E0E0E0; 
-            border: 1px solid #4A5568;
-        }
-        #refreshButton:hover { 
-            background-color: #4A5568; 
-            color: #FFFFFF;
-        }
-        #refreshButton:pressed {
-            background-color: #2A3140;
-        }
-
-        /* Confirm/Place Order button styling */
-        #confirmButton {
-            background-color: #29C7C9; 
-            color: #161A25;
-            font-weight: bold;
-        }
-        #confirmButton:hover { 
-            background-color: #32E0E3; 
-            color: #161A25;
-        }
-        #confirmButton:pressed {
-            background-color: #1FA8AA;
-        }
-        """)
+        self._container.setStyleSheet(self._STYLESHEET)
 
     def _update_summary(self):
-        qty = self.lots_spinbox.value() * self.contract.lot_size
+        self._update_timer.start()
+
+    def _do_update_summary(self):
+        qty = self.lots_spinbox.value() * self._lot_size
         price = self.price_spinbox.value()
 
         if self.buy_radio.isChecked():
             total_value = int(qty * price)
-            formatted_value = locale.format_string("%d", total_value, grouping=True)
             self.total_value_label.setText(
-                f"Required Premium: ₹ {formatted_value}"
+                f"Required Premium: ₹ {format_inr(total_value)}"
             )
         else:
             self.total_value_label.setText(
@@ -424,6 +452,7 @@ class QuickOrderDialog(QDialog):
 
     def update_contract_data(self, new_contract: Contract):
         self.contract = new_contract
+        self._lot_size = new_contract.lot_size
 
         # Determine ATM status
         is_atm = (
@@ -458,10 +487,14 @@ class QuickOrderDialog(QDialog):
         # Update internal state
         self._last_ltp = self.contract.ltp
 
-        # Update price input intelligently
-        self.price_spinbox.setValue(
-            calculate_smart_limit_price(self.contract)
-        )
+        # Update price input intelligently; the summary is refreshed once below
+        self.price_spinbox.blockSignals(True)
+        try:
+            self.price_spinbox.setValue(
+                calculate_smart_limit_price(self.contract)
+            )
+        finally:
+            self.price_spinbox.blockSignals(False)
 
         self._update_summary()
 
@@ -470,63 +503,73 @@ class QuickOrderDialog(QDialog):
         )
 
     def populate_from_order(self, data):
-        is_position = isinstance(data, Position)
-
-        if is_position:
-            # It's a Position object from an open position
-            position = data
-            if position.quantity > 0:
-                self.buy_radio.setChecked(True)
-            else:
-                self.sell_radio.setChecked(True)
-
-            lot_size = self.contract.lot_size if self.contract and self.contract.lot_size > 0 else 1
-            lots = int(abs(position.quantity) / lot_size)
-            self.lots_spinbox.setValue(lots)
-
-            self.price_spinbox.setValue(position.average_price)
+        # Block the summary-driving widgets while filling them, then update once
+        summary_inputs = (self.lots_spinbox, self.price_spinbox, self.buy_radio, self.sell_radio)
+        for widget in summary_inputs:
+            widget.blockSignals(True)
+        try:
+            is_position = isinstance(data, Position)
+
+            if is_position:
+                # It's a Position object from an open position
+                position = data
+                if position.quantity > 0:
+                    self.buy_radio.setChecked(True)
+                else:
+                    self.sell_radio.setChecked(True)
+
+                lot_size = self.contract.lot_size if self.contract and self.contract.lot_size > 0 else 1
+                lots = int(abs(position.quantity) / lot_size)
+                self.lots_spinbox.setValue(lots)
+
+                self.price_spinbox.setValue(position.average_price)
+
+                # Disable editing of transaction type and quantity when modifying
+                self.buy_radio.setEnabled(False)
+                self.sell_radio.setEnabled(False)
+                self.lots_spinbox.setEnabled(False)
+                self.price_spinbox.setEnabled(False)  # Also disable price, as we are only modifying SL/TP
+
+                # Populate SL
+                if position.stop_loss_price is not None:
+                    self.sl_checkbox.setChecked(True)
+                    sl_amount = abs(position.average_price - position.stop_loss_price) * abs(position.quantity)
+                    self.sl_spinbox.setValue(sl_amount)
+
+                # Populate TP
+                if position.target_price is not None:
+                    self.tp_checkbox.setChecked(True)
+                    tp_amount = abs(position.target_price - position.average_price) * abs(position.quantity)
+                    self.tp_spinbox.setValue(tp_amount)
+
+                # Populate TSL
+                if position.trailing_stop_loss is not None and position.trailing_stop_loss > 0:
+                    self.tsl_checkbox.setChecked(True)
+                    self.tsl_spinbox.setValue(position.trailing_stop_loss)
+
+                logger.info(f"Dialog populated for modifying SL/TP for order {position.order_id}")
 
-            # Disable editing of transaction type and quantity when modifying
-            self.buy_radio.setEnabled(False)
-            self.sell_radio.setEnabled(False)
-            self.lots_spinbox.setEnabled(False)
-            self.price_spinbox.setEnabled(False)  # Also disable price, as we are only modifying SL/TP
-
-            # Populate SL
-            if position.stop_loss_price is not None:
-                self.sl_checkbox.setChecked(True)
-                sl_amount = abs(position.average_price - position.stop_loss_price) * abs(position.quantity)
-                self.sl_spinbox.setValue(sl_amount)
-
-            # Populate TP
-            if position.target_price is not None:
-                self.tp_checkbox.setChecked(True)
-                tp_amount = abs(position.target_price - position.average_price) * abs(position.quantity)
-                self.tp_spinbox.setValue(tp_amount)
-
-            # Populate TSL
-            if position.trailing_stop_loss is not None and position.trailing_stop_loss > 0:
-                self.tsl_checkbox.setChecked(True)
-                self.tsl_spinbox.setValue(position.trailing_stop_loss)
-
-            logger.info(f"Dialog populated for modifying SL/TP for order {position.order_id}")
-
-        else:
-            # It's an order_data dict from a pending order
-            order_data = data
-            if order_data.get('transaction_type') == 'SELL':
-                self.sell_radio.setChecked(True)
             else:
-                self.buy_radio.setChecked(True)
+                # It's an order_data dict from a pending order
+                order_data = data
+                if order_data.get('transaction_type') == 'SELL':
+                    self.sell_radio.setChecked(True)
+                else:
+                    self.buy_radio.setChecked(True)
+
+                quantity = order_data.get('quantity', 0)
+                lot_size = self.contract.lot_size if self.contract and self.contract.lot_size > 0 else 1
+                lots = int(quantity / lot_size)
+                self.lots_spinbox.setValue(lots)
+
+                price = order_data.get('price', self.contract.ltp)
+                self.price_spinbox.setValue(price)
+                logger.info(f"Dialog populated for modifying order {order_data.get('order_id')}")
+        finally:
+            for widget in summary_inputs:
+                widget.blockSignals(False)
 
-            quantity = order_data.get('quantity', 0)
-            lot_size = self.contract.lot_size if self.contract and self.contract.lot_size > 0 else 1
-            lots = int(quantity / lot_size)
-            self.lots_spinbox.setValue(lots)
-
-            price = order_data.get('price', self.contract.ltp)
-            self.price_spinbox.setValue(price)
-            logger.info(f"Dialog populated for modifying order {order_data.get('order_id')}")
+        self._update_summary()
 
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.LeftButton:
@@ -1,16 +1,131 @@
 import logging
+from functools import cached_property
+
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTabWidget,
     QWidget, QGroupBox, QGridLayout, QLabel, QLineEdit,
     QSpinBox, QComboBox, QCheckBox, QPushButton, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QByteArray
 
 from utils.config_manager import ConfigManager
 from core.token_manager import TokenManager
 
 logger = logging.getLogger(__name__)
 
+_TAB_TITLES = ("TRADING", "DISPLAY", "API")
+
+# Settings edited by this dialog and their fallbacks when absent from the config
+_SETTING_DEFAULTS = {
+    "default_symbol": "NIFTY",
+    "default_product": "MIS",
+    "default_lots": 1,
+    "auto_refresh": True,
+    "refresh_interval": 2,
+    "auto_adjust_ladder": True,
+}
+
+_STYLE = """
+    #mainContainer {
+        background-color: #161A25;
+        border: 1px solid #3A4458;
+        border-radius: 12px;
+        font-family: "Segoe UI", sans-serif;
+    }
+    #dialogTitle {
+        color: #FFFFFF;
+        font-size: 16px;
+        font-weight: 600;
+    }
+    #closeButton {
+        background-color: transparent;
+        border: none;
+        color: #8A9BA8;
+        font-size: 14px;
+        font-weight: 600;
+    }
+    #closeButton:hover {
+        color: #FFFFFF;
+    }
+    #closeButton:pressed {
+        color: #29C7C9;
+    }
+
+    QTabWidget::pane { border: none; }
+    QTabBar::tab {
+        background-color: transparent;
+        color: #8A9BA8;
+        font-weight: bold;
+        padding: 10px 20px;
+        border-bottom: 2px solid transparent;
+    }
+    QTabBar::tab:selected {
+        color: #FFFFFF;
+        border-bottom: 2px solid #29C7C9;
+    }
+    QTabBar::tab:hover {
+        color: #FFFFFF;
+    }
+
+    QGroupBox {
+        color: #A9B1C3;
+        border: 1px solid #2A3140;
+        border-radius: 8px;
+        font-size: 11px;
+        margin-top: 10px;
+        padding-top: 15px;
+        font-weight: bold;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+
+    QLabel {
+        color: #A9B1C3;
+        font-size: 13px;
+    }
+    QLineEdit, QSpinBox, QComboBox {
+        background-color: #212635;
+        border: 1px solid #3A4458;
+        color: #E0E0E0;
+        padding: 8px;
+        border-radius: 6px;
+        font-size: 13px;
+    }
+    QLineEdit:focus, QSpinBox:focus, QComboBox:focus {
+        border: 1px solid #29C7C9;
+    }
+
+    QCheckBox {
+        color: #A9B1C3;
+        spacing: 8px;
+    }
+
+    QPushButton {
+        font-weight: bold;
+        border-radius: 6px;
+        padding: 10px 18px;
+        border: none;
+        font-size: 12px;
+    }
+    #secondaryButton {
+        background-color: #3A4458;
+        color: #E0E0E0;
+    }
+    #secondaryButton:hover {
+        background-color: #4A5568;
+    }
+    #primaryButton {
+        background-color: #29C7C9;
+        color: #161A25;
+    }
+    #primaryButton:hover {
+        background-color: #32E0E3;
+    }
+"""
+
 
 class SettingsDialog(QDialog):
     """A premium, draggable settings dialog with a consistent dark theme."""
@@ -29,13 +144,18 @@ class SettingsDialog(QDialog):
         self.setAttribute(Qt.WA_TranslucentBackground)
 
         self._drag_pos = None
-
-        self.token_manager = TokenManager()
+        # Needed up front: the Trading tab and the saved geometry are read during construction
         self.config_manager = ConfigManager()
 
         self._setup_ui()
         self._load_settings()
         self._apply_styles()
+        self._restore_geometry()
+
+    # Built on first access; only the API tab and saving credentials touch the keyring
+    @cached_property
+    def token_manager(self) -> TokenManager:
+        return TokenManager()
 
     # ---------------- UI SETUP ---------------- #
 
@@ -49,12 +169,15 @@ class SettingsDialog(QDialog):
 
         layout.addLayout(self._create_header())
 
-        tabs = QTabWidget()
-        tabs.setObjectName("mainTabs")
-        tabs.addTab(self._create_trading_tab(), "TRADING")
-        tabs.addTab(self._create_display_tab(), "DISPLAY")
-        tabs.addTab(self._create_api_tab(), "API")
-        layout.addWidget(tabs)
+        # Only the first tab is built up front; the rest are built on first visit
+        self.tabs = QTabWidget()
+        self.tabs.setObjectName("mainTabs")
+        for title in _TAB_TITLES:
+            self.tabs.addTab(QWidget(), title)
+        self._tab_built = [False] * len(_TAB_TITLES)
+        self._build_tab(0)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        layout.addWidget(self.tabs)
 
         layout.addLayout(self._create_action_buttons())
 
@@ -103,6 +226,29 @@ class SettingsDialog(QDialog):
 
     # ---------------- TABS ---------------- #
 
+    def _on_tab_changed(self, index: int):
+        if index < 0 or self._tab_built[index]:
+            return
+        self._build_tab(index)
+        (self._load_trading_tab, self._load_display_tab, self._load_api_tab)[index]()
+
+    def _build_tab(self, index: int):
+        """Swaps the placeholder at index for the real tab page."""
+        builders = (self._create_trading_tab, self._create_display_tab, self._create_api_tab)
+        page = builders[index]()
+
+        tabs = self.tabs
+        placeholder = tabs.widget(index)
+        tabs.blockSignals(True)
+        try:
+            tabs.removeTab(index)
+            tabs.insertTab(index, page, _TAB_TITLES[index])
+            tabs.setCurrentIndex(index)
+        finally:
+            tabs.blockSignals(False)
+        placeholder.deleteLater()
+        self._tab_built[index] = True
+
     def _create_trading_tab(self) -> QWidget:
         tab = QWidget()
         layout = QVBoxLayout(tab)
@@ -189,131 +335,43 @@ class SettingsDialog(QDialog):
     # ---------------- STYLES ---------------- #
 
     def _apply_styles(self):
-        self.setStyleSheet("""
-            #mainContainer {
-                background-color: #161A25;
-                border: 1px solid #3A4458;
-                border-radius: 12px;
-                font-family: "Segoe UI", sans-serif;
-            }
-            #dialogTitle {
-                color: #FFFFFF;
-                font-size: 16px;
-                font-weight: 600;
-            }
-            #closeButton {
-                background-color: transparent;
-                border: none;
-                color: #8A9BA8;
-                font-size: 14px;
-                font-weight: 600;
-            }
-            #closeButton:hover {
-                color: #FFFFFF;
-            }
-            #closeButton:pressed {
-                color: #29C7C9;
-            }
-
-            QTabWidget::pane { border: none; }
-            QTabBar::tab {
-                background-color: transparent;
-                color: #8A9BA8;
-                font-weight: bold;
-                padding: 10px 20px;
-                border-bottom: 2px solid transparent;
-            }
-            QTabBar::tab:selected {
-                color: #FFFFFF;
-                border-bottom: 2px solid #29C7C9;
-            }
-            QTabBar::tab:hover {
-                color: #FFFFFF;
-            }
-
-            QGroupBox {
-                color: #A9B1C3;
-                border: 1px solid #2A3140;
-                border-radius: 8px;
-                font-size: 11px;
-                margin-top: 10px;
-                padding-top: 15px;
-                font-weight: bold;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-
-            QLabel {
-                color: #A9B1C3;
-                font-size: 13px;
-            }
-            QLineEdit, QSpinBox, QComboBox {
-                background-color: #212635;
-                border: 1px solid #3A4458;
-                color: #E0E0E0;
-                padding: 8px;
-                border-radius: 6px;
-                font-size: 13px;
-            }
-            QLineEdit:focus, QSpinBox:focus, QComboBox:focus {
-                border: 1px solid #29C7C9;
-            }
-
-            QCheckBox {
-                color: #A9B1C3;
-                spacing: 8px;
-            }
-
-            QPushButton {
-                font-weight: bold;
-                border-radius: 6px;
-                padding: 10px 18px;
-                border: none;
-                font-size: 12px;
-            }
-            #secondaryButton {
-                background-color: #3A4458;
-                color: #E0E0E0;
-            }
-            #secondaryButton:hover {
-                background-color: #4A5568;
-            }
-            #primaryButton {
-                background-color: #29C7C9;
-                color: #161A25;
-            }
-            #primaryButton:hover {
-                background-color: #32E0E3;
-            }
-        """)
+        self.setStyleSheet(_STYLE)
 
     # ---------------- LOGIC ---------------- #
 
     def _load_settings(self):
-        settings = self.config_manager.load_settings()
+        self._settings = self.config_manager.load_settings()
+        # Saved credentials are read from the keyring only once the API tab is opened
+        self._use_saved_credentials = True
+        self._load_trading_tab()
 
+    def _load_trading_tab(self):
+        settings = self._settings
         self.default_symbol.setCurrentText(
-            settings.get("default_symbol", "NIFTY")
+            settings.get("default_symbol", _SETTING_DEFAULTS["default_symbol"])
         )
         self.default_product.setCurrentText(
-            settings.get("default_product", "MIS")
+            settings.get("default_product", _SETTING_DEFAULTS["default_product"])
         )
         self.default_lots.setValue(
-            settings.get("default_lots", 1)
+            settings.get("default_lots", _SETTING_DEFAULTS["default_lots"])
         )
+
+    def _load_display_tab(self):
+        settings = self._settings
         self.auto_refresh.setChecked(
-            settings.get("auto_refresh", True)
+            settings.get("auto_refresh", _SETTING_DEFAULTS["auto_refresh"])
         )
         self.refresh_interval.setValue(
-            settings.get("refresh_interval", 2)
+            settings.get("refresh_interval", _SETTING_DEFAULTS["refresh_interval"])
         )
         self.auto_adjust_ladder.setChecked(
-            settings.get("auto_adjust_ladder", True)
+            settings.get("auto_adjust_ladder", _SETTING_DEFAULTS["auto_adjust_ladder"])
         )
 
+    def _load_api_tab(self):
+        if not self._use_saved_credentials:
+            return
         creds = self.token_manager.load_credentials()
         if creds:
             self.api_key.setText(creds.get("api_key", ""))
@@ -321,19 +379,23 @@ class SettingsDialog(QDialog):
             self.save_credentials.setChecked(True)
 
     def _save_settings(self):
-        settings = {
-            "default_symbol": self.default_symbol.currentText(),
-            "default_product": self.default_product.currentText(),
-            "default_lots": self.default_lots.value(),
-            "auto_refresh": self.auto_refresh.isChecked(),
-            "refresh_interval": self.refresh_interval.value(),
-            "auto_adjust_ladder": self.auto_adjust_ladder.isChecked(),
-        }
+        values = self._settings
+        if self._tab_built[0]:
+            values["default_symbol"] = self.default_symbol.currentText()
+            values["default_product"] = self.default_product.currentText()
+            values["default_lots"] = self.default_lots.value()
+        if self._tab_built[1]:
+            values["auto_refresh"] = self.auto_refresh.isChecked()
+            values["refresh_interval"] = self.refresh_interval.value()
+            values["auto_adjust_ladder"] = self.auto_adjust_ladder.isChecked()
+
+        settings = {key: values.get(key, default) for key, default in _SETTING_DEFAULTS.items()}
 
         self.config_manager.save_settings(settings)
 
         if (
-            self.save_credentials.isChecked()
+            self._tab_built[2]
+            and self.save_credentials.isChecked()
             and self.api_key.text()
             and self.api_secret.text()
         ):
@@ -356,19 +418,34 @@ class SettingsDialog(QDialog):
 
         if reply == QMessageBox.Yes:
             defaults = self.config_manager.default_settings
-
-            self.default_symbol.setCurrentText(defaults["default_symbol"])
-            self.default_product.setCurrentText(defaults["default_product"])
-            self.default_lots.setValue(defaults["default_lots"])
-            self.auto_refresh.setChecked(defaults.get("auto_refresh", True))
-            self.refresh_interval.setValue(defaults.get("refresh_interval", 2))
-            self.auto_adjust_ladder.setChecked(
-                defaults.get("auto_adjust_ladder", True)
+            self._settings.update(
+                {key: defaults.get(key, default) for key, default in _SETTING_DEFAULTS.items()}
             )
 
-            self.api_key.clear()
-            self.api_secret.clear()
-            self.save_credentials.setChecked(False)
+            if self._tab_built[0]:
+                self._load_trading_tab()
+            if self._tab_built[1]:
+                self._load_display_tab()
+
+            self._use_saved_credentials = False
+            if self._tab_built[2]:
+                self.api_key.clear()
+                self.api_secret.clear()
+                self.save_credentials.setChecked(False)
+
+    # ---------------- GEOMETRY ---------------- #
+
+    def _restore_geometry(self):
+        if geometry_str := self.config_manager.load_dialog_state("settings_dialog"):
+            self.restoreGeometry(QByteArray.fromBase64(geometry_str.encode()))
+
+    def done(self, result):
+        # accept()/reject() bypass closeEvent, so persist geometry here
+        self.config_manager.save_dialog_state(
+            "settings_dialog",
+            self.saveGeometry().toBase64().data().decode()
+        )
+        super().done(result)
 
     # ---------------- DRAGGING ---------------- #
 
@@ -1,7 +1,8 @@
 import sys
 import logging
 
-from PySide6.QtGui import QIcon
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QIcon, QGuiApplication
 from PySide6.QtWidgets import QApplication, QMessageBox, QWidget
 from kiteconnect import KiteConnect
 from core.login_manager import LoginManager
@@ -9,12 +10,6 @@ from core.main_window import ScalperMainWindow
 from core.token_manager import TokenManager
 from core.paper_trading_manager import PaperTradingManager
 from core.config import setup_logging
-import locale
-
-try:
-    locale.setlocale(locale.LC_ALL, 'en_IN.UTF-8')
-except locale.Error:
-    locale.setlocale(locale.LC_ALL, '')
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -22,6 +17,11 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Main function to run the application."""
+    # Must be set before the QApplication exists
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    QGuiApplication.setHighDpiScaleFactorRoundingPolicy(
+        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+    )
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon("assets/options_scalper.png"))
 
@@ -1,13 +1,122 @@
 # core/utils/config_manager.py
 """Configuration management for the application"""
 
+import copy
 import json
 import logging
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+
+from PySide6.QtCore import QCoreApplication, QThread, QTimer
+
+# Optional speed-up (not in requirements.txt); the stdlib json module is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+_NO_PENDING = object()
+
+
+def _load_json(f) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(f.read())
+    return json.load(f)
+
+
+def _dump_json(data: Any, f):
+    if ORJSON_AVAILABLE:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode())
+    else:
+        json.dump(data, f, indent=4)
+
+
+class _StateWriter(QThread):
+    """
+    Background writer for high-frequency UI state files (table columns,
+    dialog geometry). Snapshots are coalesced per file for FLUSH_DELAY_MS and
+    written off the GUI thread; until written, readers see the pending snapshot.
+    """
+
+    FLUSH_DELAY_MS = 500
+    _instance: Optional["_StateWriter"] = None
+
+    @classmethod
+    def instance(cls) -> Optional["_StateWriter"]:
+        """The shared writer, or None without a Qt application or after shutdown."""
+        if cls._instance is None:
+            app = QCoreApplication.instance()
+            if app is None:
+                return None
+            cls._instance = cls()
+            app.aboutToQuit.connect(cls._instance.shutdown)
+            cls._instance.start()
+        if cls._instance._closed:
+            return None
+        return cls._instance
+
+    @classmethod
+    def pending(cls, path: Path) -> Any:
+        writer = cls._instance
+        if writer is None:
+            return _NO_PENDING
+        with writer._lock:
+            return writer._pending.get(path, _NO_PENDING)
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._pending: Dict[Path, Any] = {}
+        self._dirty = set()
+        self._jobs = queue.Queue()
+        self._closed = False
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def submit(self, path: Path, data: Any):
+        with self._lock:
+            self._pending[path] = data
+            self._dirty.add(path)
+        self._flush_timer.start()
+
+    def flush(self):
+        with self._lock:
+            jobs = [(path, self._pending[path]) for path in self._dirty]
+            self._dirty.clear()
+        for job in jobs:
+            self._jobs.put(job)
+
+    def shutdown(self):
+        """Writes everything still pending and stops the thread before the app exits."""
+        self._closed = True
+        self._flush_timer.stop()
+        self.flush()
+        self._jobs.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            path, data = job
+            try:
+                with open(path, 'w') as f:
+                    _dump_json(data, f)
+            except IOError as e:
+                logger.error(f"Error writing state file {path}: {e}")
+            with self._lock:
+                if self._pending.get(path) is data and path not in self._dirty:
+                    del self._pending[path]
+
 
 class ConfigManager:
     """Handles configuration file operations"""
@@ -36,13 +145,68 @@ class ConfigManager:
             'timeout': 7,
         }
 
+        # Parsed JSON per file, keyed on the file's (mtime_ns, size) at read/write time
+        self._json_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_json_shared(self, path: Path) -> Optional[Any]:
+        """
+        Returns the cached parse of the file (or its pending snapshot), or None
+        if it doesn't exist. The file is only re-parsed when its signature
+        changes. The result is shared and must not be mutated.
+        """
+        pending = _StateWriter.pending(path)
+        if pending is not _NO_PENDING:
+            return pending
+
+        sig = self._file_signature(path)
+        if sig is None:
+            self._json_cache.pop(path, None)
+            return None
+        cached = self._json_cache.get(path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        with open(path, 'r') as f:
+            data = _load_json(f)
+        self._json_cache[path] = (sig, data)
+        return data
+
+    def _read_json(self, path: Path) -> Optional[Any]:
+        """Returns a copy of the parsed file, or None if it doesn't exist."""
+        return copy.deepcopy(self._read_json_shared(path))
+
+    def _read_json_entry(self, path: Path, key: str) -> Optional[Any]:
+        """Returns a copy of one top-level entry without copying the rest of the file."""
+        data = self._read_json_shared(path)
+        return copy.deepcopy(data.get(key)) if data is not None else None
+
+    def _write_json(self, path: Path, data: Any):
+        with open(path, 'w') as f:
+            _dump_json(data, f)
+        self._json_cache[path] = (self._file_signature(path), copy.deepcopy(data))
+
+    @staticmethod
+    def _write_state_deferred(path: Path, data: Any) -> bool:
+        """Queues a UI-state snapshot for the background writer; False if it isn't available."""
+        writer = _StateWriter.instance()
+        if writer is None:
+            return False
+        writer.submit(path, copy.deepcopy(data))
+        return True
+
     # ... (load_settings, save_settings, and other methods remain the same) ...
     def load_settings(self) -> Dict[str, Any]:
         """Load settings from a config file"""
         try:
-            if self.config_file.exists():
-                with open(self.config_file, 'r') as f:
-                    settings = json.load(f)
+            settings = self._read_json(self.config_file)
+            if settings is not None:
                 merged_settings = self.default_settings.copy()
                 merged_settings.update(settings)
                 return merged_settings
@@ -55,8 +219,7 @@ class ConfigManager:
     def save_settings(self, settings: Dict[str, Any]) -> bool:
         """Save settings to a config file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(settings, f, indent=4)
+            self._write_json(self.config_file, settings)
             logger.info("Settings saved successfully")
             return True
         except IOError as e:
@@ -71,7 +234,7 @@ class ConfigManager:
         """Save window geometry and state"""
         try:
             with open(self.window_state_file, 'w') as f:
-                json.dump(state, f, indent=4)
+                _dump_json(state, f)
             return True
         except IOError as e:
             logger.error(f"Error saving window state: {e}")
@@ -82,7 +245,7 @@ class ConfigManager:
         try:
             if self.window_state_file.exists():
                 with open(self.window_state_file, 'r') as f:
-                    return json.load(f)
+                    return _load_json(f)
             return None
         except (json.JSONDecodeError, IOError) as e:
             logger.error(f"Error loading window state: {e}")
@@ -115,18 +278,16 @@ class ConfigManager:
 
     def save_table_column_states(self, table_name: str, state: Dict[str, Any]) -> bool:
         """Saves the column state (e.g., widths) for a specific table."""
-        all_states = {}
         try:
-            if self.table_states_file.exists():
-                with open(self.table_states_file, 'r') as f:
-                    all_states = json.load(f)
+            all_states = dict(self._read_json_shared(self.table_states_file) or {})
         except (IOError, json.JSONDecodeError):
             all_states = {}
 
         all_states[table_name] = state
+        if self._write_state_deferred(self.table_states_file, all_states):
+            return True
         try:
-            with open(self.table_states_file, 'w') as f:
-                json.dump(all_states, f, indent=4)
+            self._write_json(self.table_states_file, all_states)
             return True
         except IOError as e:
             logger.error(f"Error saving table states: {e}")
@@ -134,12 +295,8 @@ class ConfigManager:
 
     def load_table_column_states(self, table_name: str) -> Optional[Dict[str, Any]]:
         """Loads the column state for a specific table."""
-        if not self.table_states_file.exists():
-            return None
         try:
-            with open(self.table_states_file, 'r') as f:
-                all_states = json.load(f)
-                return all_states.get(table_name)
+            return self._read_json_entry(self.table_states_file, table_name)
         except (IOError, json.JSONDecodeError) as e:
             logger.error(f"Error loading table states: {e}")
             return None
@@ -147,18 +304,16 @@ class ConfigManager:
     # --- ADD THESE TWO NEW METHODS ---
     def save_dialog_state(self, dialog_name: str, state_data: str) -> bool:
         """Saves the state (e.g., geometry as a string) for a specific dialog."""
-        all_states = {}
         try:
-            if self.dialog_states_file.exists():
-                with open(self.dialog_states_file, 'r') as f:
-                    all_states = json.load(f)
+            all_states = dict(self._read_json_shared(self.dialog_states_file) or {})
         except (IOError, json.JSONDecodeError):
             all_states = {}
 
         all_states[dialog_name] = state_data
+        if self._write_state_deferred(self.dialog_states_file, all_states):
+            return True
         try:
-            with open(self.dialog_states_file, 'w') as f:
-                json.dump(all_states, f, indent=4)
+            self._write_json(self.dialog_states_file, all_states)
             return True
         except IOError as e:
             logger.error(f"Error saving dialog state for {dialog_name}: {e}")
@@ -166,12 +321,8 @@ class ConfigManager:
 
     def load_dialog_state(self, dialog_name: str) -> Optional[str]:
         """Loads the state (e.g., geometry as a string) for a specific dialog."""
-        if not self.dialog_states_file.exists():
-            return None
         try:
-            with open(self.dialog_states_file, 'r') as f:
-                all_states = json.load(f)
-                return all_states.get(dialog_name)
+            return self._read_json_entry(self.dialog_states_file, dialog_name)
         except (IOError, json.JSONDecodeError) as e:
             logger.error(f"Error loading dialog state for {dialog_name}: {e}")
             return None
@@ -4,15 +4,23 @@ Utility for calculating Central Pivot Range (CPR) levels.
 """
 
 import logging
-from typing import Dict, Optional
+from collections import OrderedDict
+from datetime import date, time
+from typing import Dict, Optional, Tuple
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+MARKET_CLOSE_TIME = time(15, 30)
+
 
 class CPRCalculator:
     """Optimized CPR calculation with robust error handling."""
 
+    # Previous-day CPR per (symbol, day); a completed day's levels never change
+    _PREV_DAY_CACHE_SIZE = 256
+    _prev_day_cache: "OrderedDict[Tuple[str, date], Dict[str, float]]" = OrderedDict()
+
     @staticmethod
     def calculate_cpr_levels(high: float, low: float, close: float) -> Dict[str, float]:
         """Calculates Pivot, BC, and TC from HLC values."""
@@ -31,6 +39,34 @@ class CPRCalculator:
             'range_width': round(abs(tc - bc), 2)
         }
 
+    @classmethod
+    def get_previous_day_cpr_cached(cls, symbol: str, day: date, data: pd.DataFrame) -> Optional[Dict[str, float]]:
+        """get_previous_day_cpr() memoized on (symbol, day) for repeated intraday lookups."""
+        key = (symbol, day)
+        levels = cls._prev_day_cache.get(key)
+        if levels is not None:
+            cls._prev_day_cache.move_to_end(key)
+            return dict(levels)
+
+        levels = cls.get_previous_day_cpr(data)
+        if levels is None:
+            return None
+        # A partial fetch would otherwise pin wrong levels for the rest of the session
+        if cls._is_complete_session(data):
+            cls._prev_day_cache[key] = levels
+            if len(cls._prev_day_cache) > cls._PREV_DAY_CACHE_SIZE:
+                cls._prev_day_cache.popitem(last=False)
+        return dict(levels)
+
+    @staticmethod
+    def _is_complete_session(data: pd.DataFrame) -> bool:
+        """True if the intraday candles run up to the market close."""
+        index = data.index
+        if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+            return False
+        bar = index.to_series().diff().min()
+        return (index[-1] + bar).time() >= MARKET_CLOSE_TIME
+
     @staticmethod
     def get_previous_day_cpr(data: pd.DataFrame) -> Optional[Dict[str, float]]:
         """
@@ -49,9 +85,9 @@ class CPRCalculator:
 
         try:
             # Calculate HLC from the entire provided dataframe
-            day_high = data['high'].max()
-            day_low = data['low'].min()
-            day_close = data['close'].iloc[-1]
+            day_high = float(data['high'].to_numpy().max())
+            day_low = float(data['low'].to_numpy().min())
+            day_close = float(data['close'].to_numpy()[-1])
 
             return CPRCalculator.calculate_cpr_levels(day_high, day_low, day_close)
 
@@ -14,22 +14,25 @@ class OptionType(Enum):
     PUT = "PE"
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class Contract:
     """Represents an option contract"""
+    # Static identity
     symbol: str
-    strike: float
+    tradingsymbol: str
     option_type: str
     expiry: date
-    tradingsymbol: str
     instrument_token: int
     lot_size: int
+    strike: float
+    # Quote fields rewritten on every tick, kept in adjacent slots
     ltp: float = 0.0
+    bid: float = 0.0
+    ask: float = 0.0
     volume: int = 0
     oi: int = 0
     oi_change: int = 0
-    bid: float = 0.0
-    ask: float = 0.0
+    # Greeks
     iv: float = 0.0
     delta: float = 0.0
     gamma: float = 0.0
@@ -37,7 +40,7 @@ class Contract:
     vega: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents an open position"""
     symbol: str
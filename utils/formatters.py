@@ -0,0 +1,39 @@
+# utils/formatters.py
+"""Number and date formatting helpers that don't depend on the process locale."""
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+
+@lru_cache(maxsize=1024)
+def format_inr(n: int) -> str:
+    """Groups an integer in the Indian system (12,34,567). Cached, since margin and
+    premium labels re-render the same totals on most updates."""
+    s = str(abs(n))
+    sign = "-" if n < 0 else ""
+    if len(s) <= 3:
+        return sign + s
+    last3 = s[-3:]
+    rest = s[:-3]
+    groups = []
+    while len(rest) > 2:
+        groups.append(rest[-2:])
+        rest = rest[:-2]
+    if rest:
+        groups.append(rest)
+    return sign + ",".join(reversed(groups)) + "," + last3
+
+
+# Most calls format today's date, so keep the last (date, key) pair around
+_last_date_key: Tuple[Optional[date], str] = (None, "")
+
+
+def date_key(d: Union[date, datetime]) -> str:
+    """Returns d as 'YYYY-MM-DD', reusing the previous result for the same day."""
+    global _last_date_key
+    day = d.date() if isinstance(d, datetime) else d
+    cached_day, key = _last_date_key
+    if day != cached_day:
+        key = day.isoformat()
+        _last_date_key = (day, key)
+    return key
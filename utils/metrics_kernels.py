@@ -0,0 +1,84 @@
+# utils/metrics_kernels.py
+"""
+Fused reductions over daily P&L arrays.
+
+When Numba is installed the reduction is JIT-compiled into a single pass over
+the array; otherwise it falls back to equivalent NumPy reductions.
+"""
+import logging
+from typing import NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+class PnlStats(NamedTuple):
+    count: int
+    total: float
+    pos_sum: float
+    pos_count: int
+    neg_sum: float
+    neg_count: int
+    best: float
+    worst: float
+
+
+def _reduce_pnl_loop(arr):
+    """One sweep accumulating every statistic in scalar locals."""
+    n = arr.shape[0]
+    total = 0.0
+    pos_sum = 0.0
+    neg_sum = 0.0
+    pos_cnt = 0
+    neg_cnt = 0
+    best = arr[0]
+    worst = arr[0]
+    for i in range(n):
+        v = arr[i]
+        total += v
+        if v > 0:
+            pos_sum += v
+            pos_cnt += 1
+        elif v < 0:
+            neg_sum += v
+            neg_cnt += 1
+        if v > best:
+            best = v
+        if v < worst:
+            worst = v
+    return n, total, pos_sum, pos_cnt, neg_sum, neg_cnt, best, worst
+
+
+def _reduce_pnl_numpy(arr):
+    pos = arr[arr > 0]
+    neg = arr[arr < 0]
+    return (
+        arr.size, float(arr.sum()),
+        float(pos.sum()), pos.size,
+        float(neg.sum()), neg.size,
+        float(arr.max()), float(arr.min()),
+    )
+
+
+if NUMBA_AVAILABLE:
+    _reduce_impl = njit(cache=True)(_reduce_pnl_loop)
+else:
+    _reduce_impl = _reduce_pnl_numpy
+
+
+def reduce_pnl(arr: np.ndarray) -> PnlStats:
+    """Returns count, sums, win/loss counts and best/worst of a P&L array."""
+    if arr.size == 0:
+        return PnlStats(0, 0.0, 0.0, 0, 0.0, 0, 0.0, 0.0)
+    n, total, pos_sum, pos_cnt, neg_sum, neg_cnt, best, worst = _reduce_impl(
+        np.ascontiguousarray(arr, dtype=np.float64)
+    )
+    return PnlStats(int(n), float(total), float(pos_sum), int(pos_cnt),
+                    float(neg_sum), int(neg_cnt), float(best), float(worst))
@@ -2,10 +2,22 @@ import sqlite3
 import logging
 import os
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+from utils.formatters import date_key as format_date_key
+from utils.sqlite_pool import get_pool
 
 logger = logging.getLogger(__name__)
 
+# Kept as module constants so each pooled connection's statement cache hits
+_INSERT_PNL_SQL = """
+    INSERT INTO realized_pnl (date, pnl)
+    VALUES (?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+    pnl = pnl + excluded.pnl;
+"""
+_SELECT_PNL_SQL = "SELECT pnl FROM realized_pnl WHERE date = ?"
+
 
 class PnlLogger:
     """Handles logging realized P&L to a persistent SQLite database."""
@@ -25,15 +37,41 @@ class PnlLogger:
             self.db_path = db_path
 
         logger.info(f"P&L history database for '{mode}' mode at: {self.db_path}")
+
+        # get_all_pnl() snapshot keyed on the on-disk file signature
+        self._pnl_cache: Optional[Dict[str, float]] = None
+        self._pnl_cache_sig: Optional[Tuple] = None
+
+        self._pool = get_pool(self.db_path)
         self._create_table()
+        # Inserts are queued and committed in batches on a background thread
+        self._writer = self._pool.batch_writer(_INSERT_PNL_SQL, self._log_written)
 
-    def _get_connection(self):
-        return sqlite3.connect(self.db_path)
+    def _file_signature(self) -> Optional[Tuple]:
+        """
+        Returns (mtime_ns, size) of the database and its WAL sidecar, so writes
+        made through other PnlLogger instances also invalidate the cache.
+        """
+        sig = []
+        for path in (self.db_path, f"{self.db_path}-wal"):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                sig.append(None)
+                continue
+            except OSError:
+                return None
+            sig.append((st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def _invalidate_cache(self):
+        self._pnl_cache = None
+        self._pnl_cache_sig = None
 
     def _create_table(self):
         """Creates the 'realized_pnl' table if it doesn't exist."""
         try:
-            with self._get_connection() as conn:
+            with self._pool.writer() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS realized_pnl (
@@ -50,34 +88,29 @@ class PnlLogger:
         Logs P&L for a specific date. If an entry for the date
         exists, it adds the new P&L value to the existing one.
         """
-        date_key = pnl_date.strftime("%Y-%m-%d")
-        query = """
-            INSERT INTO realized_pnl (date, pnl)
-            VALUES (?, ?)
-            ON CONFLICT(date) DO UPDATE SET
-            pnl = pnl + excluded.pnl;
-        """
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, (date_key, pnl_value))
-                conn.commit()
-                logger.info(f"Logged P&L of {pnl_value:.2f} for date {date_key}")
-        except sqlite3.Error as e:
-            logger.error(f"Failed to log P&L for date {date_key}: {e}")
+        date_key = format_date_key(pnl_date)
+        self._writer.submit((date_key, pnl_value))
+        self._invalidate_cache()
+
+    def flush(self):
+        """Blocks until every queued P&L entry is written."""
+        self._writer.flush()
+
+    @staticmethod
+    def _log_written(params_list):
+        for date_key, pnl_value in params_list:
+            logger.info(f"Logged P&L of {pnl_value:.2f} for date {date_key}")
 
     def get_pnl_for_date(self, pnl_date: datetime) -> float:
         """
         Retrieves the total realized P&L for a specific date.
         Returns 0.0 if no entry is found for that date.
         """
-        date_key = pnl_date.strftime("%Y-%m-%d")
-        query = "SELECT pnl FROM realized_pnl WHERE date = ?"
+        self.flush()
+        date_key = format_date_key(pnl_date)
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, (date_key,))
-                result = cursor.fetchone()
+            with self._pool.reader() as conn:
+                result = conn.execute(_SELECT_PNL_SQL, (date_key,)).fetchone()
                 if result:
                     return result[0]
                 return 0.0
@@ -86,18 +119,28 @@ class PnlLogger:
             return 0.0
 
     def get_all_pnl(self) -> Dict[str, float]:
-        """Retrieves all P&L data from the database."""
+        """
+        Retrieves all P&L data from the database.
+        Served from memory while the database file is unchanged.
+        """
+        self.flush()
+        sig = self._file_signature()
+        if sig is not None and self._pnl_cache is not None and sig == self._pnl_cache_sig:
+            return dict(self._pnl_cache)
+
         query = "SELECT date, pnl FROM realized_pnl"
         pnl_data = {}
         try:
-            with self._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.reader() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
                 cursor.execute(query)
                 rows = cursor.fetchall()
                 for row in rows:
                     pnl_data[row['date']] = row['pnl']
-            return pnl_data
+            self._pnl_cache = pnl_data
+            self._pnl_cache_sig = sig
+            return dict(pnl_data)
         except sqlite3.Error as e:
             logger.error(f"Failed to fetch P&L data from database: {e}")
             return {}
\ No newline at end of file
@@ -1,39 +1,57 @@
+# Prices are handled in integer paise so comparisons and tick rounding are exact.
+# The LTP buffers use thousandths of a paise (milli-paise) so their percentages
+# stay integral too.
+_TICK_PAISE = 5
+_MP_PER_PAISE = 1000
+
+
+def _to_paise(price: float) -> int:
+    return int(round(price * 100))
+
+
+def _round_div(n: int, d: int) -> int:
+    """n / d rounded half-to-even, like round(), without going through float."""
+    q, r = divmod(n, d)
+    if 2 * r > d or (2 * r == d and q % 2):
+        q += 1
+    return q
+
+
 def calculate_smart_limit_price(contract) -> float:
     """
     Calculate intelligent default limit price using LTP and bid-ask spread.
     """
     base_price = contract.ltp
-    bid_price = contract.bid
     ask_price = contract.ask
-    tick_size = 0.05
 
     if base_price <= 0:
         return ask_price if ask_price > 0 else 1.0
 
-    spread_valid = 0 < bid_price < ask_price
-
-    if spread_valid:
-        spread = ask_price - bid_price
-        mid_price = (bid_price + ask_price) / 2
-        spread_pct = spread / mid_price * 100
+    base = _to_paise(base_price)
+    bid = _to_paise(contract.bid)
+    ask = _to_paise(ask_price)
 
-        if spread_pct <= 0.5:
-            target = bid_price + tick_size
-        elif spread_pct <= 1.5:
-            target = mid_price
+    if 0 < bid < ask:
+        # spread_pct = (ask - bid) / mid * 100, compared without division
+        spread_x400 = (ask - bid) * 400
+        if spread_x400 <= bid + ask:  # <= 0.5%
+            ticks = _round_div(bid + _TICK_PAISE, _TICK_PAISE)
+        elif spread_x400 <= 3 * (bid + ask):  # <= 1.5%
+            ticks = _round_div(bid + ask, 2 * _TICK_PAISE)
         else:
-            target = ask_price - tick_size
-
-        return round(max(target, tick_size) / tick_size) * tick_size
+            ticks = _round_div(ask - _TICK_PAISE, _TICK_PAISE)
+        return max(ticks, 1) * _TICK_PAISE / 100
 
     # Fallback: use buffered LTP pricing
-    if base_price < 5:
-        buffer = max(0.15, base_price * 0.05)
-    elif base_price < 20:
-        buffer = max(0.25, base_price * 0.03)
-    elif base_price < 100:
-        buffer = min(base_price * 0.02, 2.0)
+    if base < 500:
+        buffer = max(15_000, base * 50)
+    elif base < 2000:
+        buffer = max(25_000, base * 30)
+    elif base < 10000:
+        buffer = min(base * 20, 200_000)
     else:
-        buffer = min(base_price * 0.015, 5.0)
+        buffer = min(base * 15, 500_000)
+
+    ticks = _round_div(base * _MP_PER_PAISE + buffer, _TICK_PAISE * _MP_PER_PAISE)
+    return ticks * _TICK_PAISE / 100
 
-    return round((base_price + buffer) / tick_size) * tick_size
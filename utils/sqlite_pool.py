@@ -0,0 +1,194 @@
+# utils/sqlite_pool.py
+"""Long-lived, shared SQLite connections for the trade and P&L loggers."""
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+READER_POOL_SIZE = 4
+
+
+def configure_connection(conn: sqlite3.Connection, db_path: str) -> sqlite3.Connection:
+    """
+    WAL lets readers proceed while a write commits, and synchronous=NORMAL
+    drops the per-commit fsync (still crash-safe under WAL).
+    """
+    if db_path != ':memory:':
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    return conn
+
+
+class ConnectionPool:
+    """
+    One writer connection guarded by a lock plus up to `size` reader
+    connections handed out through a queue. Connections are opened on first
+    use, configured once, and kept open for the life of the process.
+    """
+
+    def __init__(self, db_path: str, size: int = READER_POOL_SIZE):
+        self.db_path = db_path
+        self._size = size
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._batch_writers: Dict[str, "BatchWriter"] = {}
+        self._batch_writers_lock = threading.Lock()
+        # An in-memory database only exists on the connection that created it
+        self._single = db_path == ':memory:'
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return configure_connection(conn, self.db_path)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Yields the writer connection; commits on success, rolls back on error."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            with self._writer:
+                yield self._writer
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Yields a pooled reader connection, blocking if all are in use."""
+        if self._single:
+            with self.writer() as conn:
+                yield conn
+            return
+
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                can_open = self._reader_count < self._size
+                if can_open:
+                    self._reader_count += 1
+            conn = self._connect() if can_open else self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def batch_writer(self, sql: str,
+                     on_written: Optional[Callable[[List[Tuple]], None]] = None) -> "BatchWriter":
+        """Returns the shared background writer for `sql` on this database."""
+        with self._batch_writers_lock:
+            writer = self._batch_writers.get(sql)
+            if writer is None:
+                writer = self._batch_writers[sql] = BatchWriter(self, sql, on_written)
+            return writer
+
+
+class BatchWriter:
+    """
+    Daemon thread that drains queued parameter tuples into `sql` with
+    executemany, one transaction per batch of up to MAX_BATCH rows gathered
+    within MAX_WAIT_S. Callers only pay for a queue put.
+    """
+
+    MAX_BATCH = 100
+    MAX_WAIT_S = 0.05
+    _STOP = object()
+
+    def __init__(self, pool: ConnectionPool, sql: str,
+                 on_written: Optional[Callable[[List[Tuple]], None]] = None):
+        self._pool = pool
+        self._sql = sql
+        self._on_written = on_written
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._drain, name="sqlite-batch-writer", daemon=True)
+        self._thread.start()
+        # Daemon threads are killed at exit, so drain whatever is still queued first
+        atexit.register(self.flush)
+
+    def submit(self, params: Tuple):
+        self._queue.put(params)
+
+    def flush(self):
+        """Blocks until everything submitted so far is committed (or failed)."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _write(self, batch: List[Tuple]):
+        try:
+            with self._pool.writer() as conn:
+                conn.executemany(self._sql, batch)
+            written = batch
+        except sqlite3.Error:
+            # One bad row rolls back the whole batch; retry row by row so only
+            # the offending rows are dropped
+            written = []
+            for params in batch:
+                try:
+                    with self._pool.writer() as conn:
+                        conn.execute(self._sql, params)
+                    written.append(params)
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to write queued row {params!r} to {self._pool.db_path}: {e}")
+        if written and self._on_written is not None:
+            self._on_written(written)
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.MAX_WAIT_S
+            while len(batch) < self.MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                self._write(batch)
+            except Exception as e:  # keep the writer alive for later batches
+                logger.error(f"Failed to write {len(batch)} queued row(s) to {self._pool.db_path}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                self._queue.task_done()
+                return
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Returns the process-wide pool for a database file, creating it on first use."""
+    if db_path == ':memory:':
+        return ConnectionPool(db_path)
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path)
+        return pool
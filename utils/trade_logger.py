@@ -2,11 +2,102 @@
 import sqlite3
 import logging
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from typing import List, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from utils.formatters import date_key
+from utils.sqlite_pool import get_pool
 
 logger = logging.getLogger(__name__)
 
+# tradingsymbol, status and product repeat across millions of rows, so `orders`
+# stores small integer ids into lookup tables. The `trades` view joins the names
+# back and its INSTEAD OF trigger resolves them on insert, so callers (and the
+# batch writer's single executemany) keep working with plain strings.
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS symbols (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+    CREATE TABLE IF NOT EXISTS statuses (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+    CREATE TABLE IF NOT EXISTS products (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+    CREATE TABLE IF NOT EXISTS orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id TEXT UNIQUE,
+        timestamp TEXT NOT NULL,
+        symbol_id INTEGER NOT NULL REFERENCES symbols(id),
+        transaction_type TEXT NOT NULL,
+        quantity INTEGER NOT NULL,
+        average_price REAL NOT NULL,
+        status_id INTEGER NOT NULL REFERENCES statuses(id),
+        product_id INTEGER REFERENCES products(id),
+        pnl REAL DEFAULT 0.0
+    );
+    CREATE INDEX IF NOT EXISTS idx_orders_timestamp ON orders(timestamp);
+    CREATE VIEW IF NOT EXISTS trades AS
+        SELECT o.id, o.order_id, o.timestamp, sy.name AS tradingsymbol, o.transaction_type,
+               o.quantity, o.average_price, st.name AS status, pr.name AS product, o.pnl
+        FROM orders o
+        JOIN symbols sy ON sy.id = o.symbol_id
+        JOIN statuses st ON st.id = o.status_id
+        LEFT JOIN products pr ON pr.id = o.product_id;
+    CREATE TRIGGER IF NOT EXISTS trades_insert INSTEAD OF INSERT ON trades
+    BEGIN
+        INSERT OR IGNORE INTO symbols (name) VALUES (NEW.tradingsymbol);
+        INSERT OR IGNORE INTO statuses (name) VALUES (NEW.status);
+        INSERT OR IGNORE INTO products (name) SELECT NEW.product WHERE NEW.product IS NOT NULL;
+        -- Upsert in place rather than REPLACE's delete+insert, and skip rows whose
+        -- values haven't changed (repeated status polls for the same order)
+        INSERT INTO orders
+        (id, order_id, timestamp, symbol_id, transaction_type, quantity, average_price, status_id, product_id, pnl)
+        VALUES (
+            NEW.id, NEW.order_id, NEW.timestamp,
+            (SELECT id FROM symbols WHERE name = NEW.tradingsymbol),
+            NEW.transaction_type, NEW.quantity, NEW.average_price,
+            (SELECT id FROM statuses WHERE name = NEW.status),
+            (SELECT id FROM products WHERE name = NEW.product),
+            NEW.pnl
+        )
+        ON CONFLICT(order_id) DO UPDATE SET
+            timestamp = excluded.timestamp,
+            symbol_id = excluded.symbol_id,
+            transaction_type = excluded.transaction_type,
+            quantity = excluded.quantity,
+            average_price = excluded.average_price,
+            status_id = excluded.status_id,
+            product_id = excluded.product_id,
+            pnl = excluded.pnl
+        WHERE timestamp IS NOT excluded.timestamp
+            OR symbol_id IS NOT excluded.symbol_id
+            OR transaction_type IS NOT excluded.transaction_type
+            OR quantity IS NOT excluded.quantity
+            OR average_price IS NOT excluded.average_price
+            OR status_id IS NOT excluded.status_id
+            OR product_id IS NOT excluded.product_id
+            OR pnl IS NOT excluded.pnl;
+    END;
+"""
+# Databases created before the lookup tables keep the names inline in `orders`;
+# rebuild it through the view, keeping the original ids
+_MIGRATE_LEGACY_SQL = """
+    ALTER TABLE orders RENAME TO orders_legacy;
+    DROP INDEX IF EXISTS idx_orders_timestamp;
+""" + _SCHEMA_SQL + """
+    INSERT INTO trades
+    (id, order_id, timestamp, tradingsymbol, transaction_type, quantity, average_price, status, product, pnl)
+    SELECT id, order_id, timestamp, tradingsymbol, transaction_type, quantity, average_price, status, product, pnl
+    FROM orders_legacy ORDER BY id;
+    DROP TABLE orders_legacy;
+"""
+_INSERT_TRADE_SQL = """
+    INSERT INTO trades
+    (order_id, timestamp, tradingsymbol, transaction_type, quantity, average_price, status, product, pnl)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Range form so the timestamp index is usable; bounds are the day and the next day
+_SELECT_TRADES_FOR_DATE_SQL = (
+    "SELECT * FROM trades WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp DESC"
+)
+
 
 class TradeLogger:
     """
@@ -27,48 +118,27 @@ class TradeLogger:
             self.db_path = db_path
 
         logger.info(f"Trade history database for '{mode}' mode at: {self.db_path}")
+        self._pool = get_pool(self.db_path)
         self._create_table()
-
-    def _get_connection(self):
-        """Creates and returns a database connection."""
-        return sqlite3.connect(self.db_path)
+        # Inserts are queued and committed in batches on a background thread
+        self._writer = self._pool.batch_writer(_INSERT_TRADE_SQL, self._log_written)
 
     def _create_table(self):
-        """Creates the 'orders' table if it doesn't already exist."""
+        """Creates the 'orders' table and its lookups, migrating an older layout if present."""
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                # ADDED the 'pnl' column to store profit and loss
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS orders (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        order_id TEXT UNIQUE,
-                        timestamp TEXT NOT NULL,
-                        tradingsymbol TEXT NOT NULL,
-                        transaction_type TEXT NOT NULL,
-                        quantity INTEGER NOT NULL,
-                        average_price REAL NOT NULL,
-                        status TEXT NOT NULL,
-                        product TEXT,
-                        pnl REAL DEFAULT 0.0
-                    )
-                """)
-                conn.commit()
+            with self._pool.writer() as conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(orders)")}
+                if 'tradingsymbol' in columns:
+                    logger.info("Migrating trade history to interned symbol/status/product columns.")
+                    conn.executescript("BEGIN;" + _MIGRATE_LEGACY_SQL + "COMMIT;")
+                else:
+                    conn.executescript(_SCHEMA_SQL)
         except sqlite3.Error as e:
             logger.error(f"Database error while creating table: {e}")
 
-    def log_trade(self, order_data: Dict):
-        """Logs a single completed trade to the database."""
-        if not order_data.get('order_id'):
-            logger.warning("Attempted to log a trade without an order_id. Skipping.")
-            return
-
-        query = """
-            INSERT OR REPLACE INTO orders
-            (order_id, timestamp, tradingsymbol, transaction_type, quantity, average_price, status, product, pnl)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        params = (
+    @staticmethod
+    def _trade_params(order_data: Dict) -> Tuple:
+        return (
             order_data.get('order_id'),
             order_data.get('order_timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
             order_data.get('tradingsymbol'),
@@ -80,25 +150,48 @@ class TradeLogger:
             order_data.get('pnl', 0.0)
         )
 
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                conn.commit()
-                logger.info(f"Logged/Replaced trade for order ID: {params[0]} with PNL: {params[8]}")
-        except sqlite3.Error as e:
-            logger.error(f"Failed to log trade for order ID {params[0]}: {e}")
+    def log_trade(self, order_data: Dict):
+        """
+        Queues a single completed trade for the background writer, which commits
+        it together with any other trades logged around the same time.
+        """
+        if not order_data.get('order_id'):
+            logger.warning("Attempted to log a trade without an order_id. Skipping.")
+            return
+        self._writer.submit(self._trade_params(order_data))
+
+    def log_trades(self, orders: List[Dict]):
+        """Queues several completed trades and waits until they are committed."""
+        params_list = [self._trade_params(o) for o in orders if o.get('order_id')]
+        if len(params_list) != len(orders):
+            logger.warning("Skipped trades without an order_id.")
+        for params in params_list:
+            self._writer.submit(params)
+        self.flush()
+
+    def flush(self):
+        """Blocks until every queued trade is written. Call before shutdown."""
+        self._writer.flush()
+
+    @staticmethod
+    def _log_written(params_list: List[Tuple]):
+        for params in params_list:
+            logger.info(f"Logged/Replaced trade for order ID: {params[0]} with PNL: {params[8]}")
+
+    @staticmethod
+    def _day_bounds(trade_date: datetime) -> Tuple[str, str]:
+        return date_key(trade_date), (trade_date + timedelta(days=1)).strftime('%Y-%m-%d')
 
     def get_trades_for_date(self, trade_date: datetime) -> List[Dict]:
         """Retrieves all completed trades for a specific date."""
-        date_str = trade_date.strftime('%Y-%m-%d')
-        query = "SELECT * FROM orders WHERE date(timestamp) = ? ORDER BY timestamp DESC"
+        self.flush()
+        date_str = date_key(trade_date)
         trades = []
         try:
-            with self._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute(query, (date_str,))
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(_SELECT_TRADES_FOR_DATE_SQL, self._day_bounds(trade_date))
                 rows = cursor.fetchall()
                 for row in rows:
                     trades.append(dict(row))
@@ -107,19 +200,40 @@ class TradeLogger:
             logger.error(f"Failed to fetch trades for date {date_str}: {e}")
             return []
 
-    def get_all_trades(self) -> List[Dict]:
-        """Retrieves all completed trades from the database, most recent first."""
-        query = "SELECT * FROM orders ORDER BY timestamp DESC"
-        trades = []
+    def get_trades_df(self, trade_date: datetime) -> pd.DataFrame:
+        """Returns the trades for a date as a typed DataFrame, decoded column-wise by pandas."""
+        self.flush()
+        date_str = date_key(trade_date)
         try:
-            with self._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.reader() as conn:
+                return pd.read_sql_query(_SELECT_TRADES_FOR_DATE_SQL, conn,
+                                         params=self._day_bounds(trade_date), parse_dates=['timestamp'])
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            logger.error(f"Failed to fetch trades for date {date_str}: {e}")
+            return pd.DataFrame()
+
+    def iter_trades(self, limit: Optional[int] = None) -> Iterator[sqlite3.Row]:
+        """
+        Yields trades most recent first without building the whole history up front.
+        The pooled connection is held until the generator is exhausted or closed.
+        """
+        self.flush()
+        query = "SELECT * FROM trades ORDER BY timestamp DESC"
+        params: Tuple = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        try:
+            with self._pool.reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                for row in rows:
-                    trades.append(dict(row))
-            return trades
+                cursor.row_factory = sqlite3.Row
+                cursor.arraysize = 1000
+                cursor.execute(query, params)
+                while rows := cursor.fetchmany():
+                    yield from rows
         except sqlite3.Error as e:
             logger.error(f"Failed to fetch trades from database: {e}")
-            return []
\ No newline at end of file
+
+    def get_all_trades(self) -> List[Dict]:
+        """Retrieves all completed trades from the database, most recent first."""
+        return [dict(row) for row in self.iter_trades()]
@@ -1,4 +1,8 @@
 import logging
+import math
+import weakref
+from functools import lru_cache
+from typing import ClassVar, Optional
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QGridLayout, QSizePolicy, QToolTip
 from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QCursor
@@ -8,6 +12,18 @@ logger = logging.getLogger(__name__)
 
 def format_indian_currency(amount: float) -> str:
     """Format number in Indian currency style (lakhs, crores) without rupee symbol."""
+    if not math.isfinite(amount):
+        return _format_amount(amount)
+    # Quantised to paise so FP noise in otherwise-unchanged values still hits the cache
+    return _format_paise(round(amount * 100))
+
+
+@lru_cache(maxsize=2048)
+def _format_paise(paise: int) -> str:
+    return _format_amount(paise / 100)
+
+
+def _format_amount(amount: float) -> str:
     if amount == 0:
         return "0"
 
@@ -33,18 +49,26 @@ class AccountSummaryWidget(QWidget):
     """
     pnl_history_requested = Signal()
 
+    PROFIT_STYLE = "color: #1DE9B6;"
+    LOSS_STYLE = "color: #FF4081;"
+    WARN_STYLE = "color: #FFB74D;"
+    NEUTRAL_STYLE = "color: #B0BEC5;"
+    MARGIN_STYLE = "color: #00B0FF;"
+
+    # One tooltip-delay timer for all instances; it fires for whichever
+    # widget the mouse entered last. The owner is held weakly and released on
+    # hide/destroy, since Qt sends no leaveEvent when a widget is deleted.
+    _shared_tooltip_timer: ClassVar[Optional[QTimer]] = None
+    _tooltip_owner: ClassVar[Optional["weakref.ref[AccountSummaryWidget]"]] = None
+
     def __init__(self):
         super().__init__()
         self.labels = {}
+        self._last_texts = {}
+        self._last_styles = {}
+        self.destroyed.connect(AccountSummaryWidget._on_widget_destroyed)
         self._setup_ui()
         self._apply_styles()
-
-        # Timer for custom tooltip delay
-        self.tooltip_timer = QTimer(self)
-        self.tooltip_timer.setSingleShot(True)
-        self.tooltip_timer.setInterval(10000)  # 10 seconds
-        self.tooltip_timer.timeout.connect(self._show_custom_tooltip)
-
         self.update_summary()  # Initialize with default zero values
 
     def _setup_ui(self):
@@ -103,32 +127,35 @@ class AccountSummaryWidget(QWidget):
                        used_margin=0.0, available_margin=0.0,
                        win_rate=0.0, trade_count=0):
         """Public method to update all widget labels with new data."""
-        profit_color = "#1DE9B6"
-        loss_color = "#FF4081"
-        neutral_color = "#B0BEC5"
-        margin_color = "#00B0FF"
-
         # P&L Breakdown
-        self.labels['unrealized_pnl'].setText(format_indian_currency(unrealized_pnl))
-        self.labels['unrealized_pnl'].setStyleSheet(f"color: {'{profit_color}' if unrealized_pnl >= 0 else '{loss_color}'};")
-
-        self.labels['realized_pnl'].setText(format_indian_currency(realized_pnl))
-        self.labels['realized_pnl'].setStyleSheet(f"color: {'{profit_color}' if realized_pnl >= 0 else '{loss_color}'};")
+        self._set_label('unrealized_pnl', format_indian_currency(unrealized_pnl),
+                        self.PROFIT_STYLE if unrealized_pnl >= 0 else self.LOSS_STYLE)
+        self._set_label('realized_pnl', format_indian_currency(realized_pnl),
+                        self.PROFIT_STYLE if realized_pnl >= 0 else self.LOSS_STYLE)
 
         # Margin Details
-        self.labels['used_margin'].setText(format_indian_currency(used_margin))
-        self.labels['used_margin'].setStyleSheet(f"color: {margin_color};")
-
-        self.labels['available_margin'].setText(format_indian_currency(available_margin))
-        self.labels['available_margin'].setStyleSheet(f"color: {margin_color};")
+        self._set_label('used_margin', format_indian_currency(used_margin), self.MARGIN_STYLE)
+        self._set_label('available_margin', format_indian_currency(available_margin), self.MARGIN_STYLE)
 
         # Performance Metrics
-        win_rate_color = profit_color if win_rate >= 60 else "#FFB74D" if win_rate >= 40 else loss_color if trade_count > 0 else neutral_color
-        self.labels['win_rate'].setText(f"{win_rate:.0f}%")
-        self.labels['win_rate'].setStyleSheet(f"color: {win_rate_color};")
-
-        self.labels['trade_count'].setText(str(trade_count))
-        self.labels['trade_count'].setStyleSheet(f"color: {neutral_color};")
+        win_rate_style = (self.PROFIT_STYLE if win_rate >= 60 else self.WARN_STYLE if win_rate >= 40
+                          else self.LOSS_STYLE if trade_count > 0 else self.NEUTRAL_STYLE)
+        self._set_label('win_rate', f"{win_rate:.0f}%", win_rate_style)
+        self._set_label('trade_count', str(trade_count), self.NEUTRAL_STYLE)
+
+    def _set_label(self, key: str, text: str, style: str):
+        """
+        Pushes text/style to a label only when they differ from what it shows;
+        most updates leave margins and counts unchanged. setStyleSheet in
+        particular re-parses the sheet.
+        """
+        label = self.labels[key]
+        if self._last_texts.get(key) != text:
+            self._last_texts[key] = text
+            label.setText(text)
+        if self._last_styles.get(key) != style:
+            self._last_styles[key] = style
+            label.setStyleSheet(style)
 
     def _apply_styles(self):
         """Applies a semi-transparent, high-contrast black and cyan theme."""
@@ -172,17 +199,54 @@ class AccountSummaryWidget(QWidget):
             }
         """)
 
+    @classmethod
+    def _tooltip_timer(cls) -> QTimer:
+        if cls._shared_tooltip_timer is None:
+            timer = QTimer()
+            timer.setSingleShot(True)
+            timer.setInterval(10000)  # 10 seconds
+            timer.timeout.connect(cls._on_tooltip_timeout)
+            cls._shared_tooltip_timer = timer
+        return cls._shared_tooltip_timer
+
+    @classmethod
+    def _on_tooltip_timeout(cls):
+        owner = cls._tooltip_owner() if cls._tooltip_owner is not None else None
+        if owner is not None:
+            owner._show_custom_tooltip()
+
+    @classmethod
+    def _release_tooltip(cls, widget=None):
+        """Stops the shared timer if widget owns it, or if its owner is already gone."""
+        if cls._tooltip_owner is None:
+            return
+        owner = cls._tooltip_owner()
+        if owner is None or widget is None or owner is widget:
+            cls._tooltip_owner = None
+            cls._shared_tooltip_timer.stop()
+
+    @classmethod
+    def _on_widget_destroyed(cls, _obj=None):
+        # The dying wrapper can't be reliably matched against the owner, so release unconditionally
+        cls._release_tooltip()
+
     def enterEvent(self, event):
         """Start the timer when the mouse enters."""
-        self.tooltip_timer.start()
+        AccountSummaryWidget._tooltip_owner = weakref.ref(self)
+        self._tooltip_timer().start()
         super().enterEvent(event)
 
     def leaveEvent(self, event):
         """Stop the timer and hide the tooltip when the mouse leaves."""
-        self.tooltip_timer.stop()
+        self._release_tooltip(self)
         QToolTip.hideText()
         super().leaveEvent(event)
 
+    def hideEvent(self, event):
+        """A hidden widget gets no leaveEvent, so give up the timer here too."""
+        self._release_tooltip(self)
+        super().hideEvent(event)
+
     def mouseDoubleClickEvent(self, event):
         """Emits a signal when the widget is double-clicked."""
         self.pnl_history_requested.emit()
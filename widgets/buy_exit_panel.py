@@ -5,15 +5,14 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton,
     QSpinBox, QGroupBox, QRadioButton, QButtonGroup, QFrame, QAbstractSpinBox
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QCursor, QFont
 from kiteconnect import KiteConnect
 from PySide6.QtCore import QPropertyAnimation, QEasingCurve
 from PySide6.QtWidgets import QGraphicsOpacityEffect
 
 from utils.data_models import OptionType, Contract
-import locale
-locale.setlocale(locale.LC_ALL, 'en_IN')
+from utils.formatters import format_inr
 logger = logging.getLogger(__name__)
 
 # -------------------------------------------------
@@ -43,6 +42,15 @@ class BuyExitPanel(QWidget):
     buy_clicked = Signal(dict)
     exit_clicked = Signal(OptionType)
 
+    # Checked radio indices -> (ATM offset, strikes skipped between legs)
+    _SKIP_TABLE = {
+        frozenset(): (0, 0),
+        frozenset({0, 2}): (0, 1),
+        frozenset({0, 3}): (0, 2),
+        frozenset({1, 2}): (1, 0),
+        frozenset({1, 3}): (1, 1),
+    }
+
     def __init__(self, kite_client: KiteConnect):
         super().__init__()
         self.kite = kite_client
@@ -56,8 +64,16 @@ class BuyExitPanel(QWidget):
         self.atm_strike = 0.0
         self.strike_interval = 50.0
         self.strike_ladder_data = []
+        self._atm_index = -1
         self.radio_history = []
 
+        # Spinbox auto-repeat and radio toggles arrive in bursts (unchecking the
+        # oldest radio fires a second toggle); recompute once per event-loop turn
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(0)
+        self._update_timer.timeout.connect(self._do_update_margin)
+
         self._setup_ui()
         self._apply_styles()
         self._update_ui_for_option_type()
@@ -286,41 +302,52 @@ class BuyExitPanel(QWidget):
     def _update_ui_for_option_type(self):
         self.title_label.setText(self.option_type.name)
         if self.option_type == OptionType.CALL:
-            self.title_label.setObjectName("panelTitleCall")
-            for radio in self.radio_buttons:
-                radio.setObjectName("callRadio")
+            title_name, radio_name = "panelTitleCall", "callRadio"
         else:
-            self.title_label.setObjectName("panelTitlePut")
+            title_name, radio_name = "panelTitlePut", "putRadio"
+        # Re-matching the stylesheet is only needed when the selectors change
+        if self.title_label.objectName() != title_name:
+            style = self.style()
+            self.title_label.setObjectName(title_name)
+            style.unpolish(self.title_label)
+            style.polish(self.title_label)
             for radio in self.radio_buttons:
-                radio.setObjectName("putRadio")
-        self.style().unpolish(self.title_label)
-        self.style().polish(self.title_label)
-        for radio in self.radio_buttons:
-            self.style().unpolish(radio)
-            self.style().polish(radio)
+                radio.setObjectName(radio_name)
+                style.unpolish(radio)
+                style.polish(radio)
         self._update_margin()
 
     def _on_buy_clicked(self):
+        # Apply any pending spinbox/radio change before reading the selection
+        if self._update_timer.isActive():
+            self._update_timer.stop()
+            self._do_update_margin()
         generated_strikes = self._generate_strikes_with_skip_logic()
         if not generated_strikes:
             logger.error("No strikes generated for order")
             return
-        total_premium = sum(s['ltp'] * self.lot_size * self.lot_quantity for s in generated_strikes)
+        total_premium = self._total_premium(generated_strikes)
         order_details = {"symbol": self.current_symbol, "option_type": self.option_type, "expiry": self.expiry,
                          "contracts_above": self.contracts_above, "contracts_below": self.contracts_below,
                          "lot_size": self.lot_size, "strikes": generated_strikes,
                          "total_premium_estimate": total_premium}
         self.buy_clicked.emit(order_details)
 
+    def _total_premium(self, strikes: List[Dict]) -> float:
+        return self.lot_size * self.lot_quantity * sum(s['ltp'] for s in strikes)
+
     def _update_margin(self):
+        self._update_timer.start()
+
+    def _do_update_margin(self):
         self.contracts_above = self.above_spin.value()
         self.contracts_below = self.below_spin.value()
         strikes = self._generate_strikes_with_skip_logic()
         total_contracts = len(strikes)
         self.total_contracts_value_label.setText(str(total_contracts))
 
-        total_premium = int(sum(s['ltp'] * self.lot_size * self.lot_quantity for s in strikes))
-        formatted_value = locale.format_string("%d", total_premium, grouping=True)
+        total_premium = int(self._total_premium(strikes))
+        formatted_value = format_inr(total_premium)
 
         html = (
             "<span style='font-size:14px; vertical-align:top;'>₹</span> "
@@ -348,6 +375,9 @@ class BuyExitPanel(QWidget):
         self.atm_strike = atm_strike
         self.strike_interval = interval
         self.strike_ladder_data = ladder_data
+        # Resolved once per ladder change rather than on every margin update
+        strike_to_idx = {d.get('strike'): i for i, d in enumerate(ladder_data)}
+        self._atm_index = strike_to_idx.get(atm_strike, -1)
         self._update_margin()
 
     def _create_radio_handler(self, index: int):
@@ -363,39 +393,31 @@ class BuyExitPanel(QWidget):
         return handler
 
     def _get_skip_strategy(self):
-        selected = {i for i, b in enumerate(self.radio_buttons) if b.isChecked()}
-        if not selected: return 0, 0
-        if len(selected) == 1: return list(selected)[0], 0
-        if selected == {0, 2}: return 0, 1
-        if selected == {0, 3}: return 0, 2
-        if selected == {1, 2}: return 1, 0
-        if selected == {1, 3}: return 1, 1
-        return list(selected)[0], 0
+        selected = frozenset(i for i, b in enumerate(self.radio_buttons) if b.isChecked())
+        return self._SKIP_TABLE.get(selected) or (next(iter(selected)), 0)
 
     def _generate_strikes_with_skip_logic(self) -> List[Dict]:
         if not self.strike_ladder_data: return []
         atm_offset, skip_count = self._get_skip_strategy()
-        try:
-            atm_index = next((i for i, d in enumerate(self.strike_ladder_data) if d.get('strike') == self.atm_strike),
-                             -1)
-        except (ValueError, TypeError):
-            atm_index = -1
+        atm_index = self._atm_index
         if atm_index < 0:
             logger.debug(f"Could not find ATM strike {self.atm_strike} in ladder data.")
             return []
         adj_atm_idx = atm_index + atm_offset
-        indices = {adj_atm_idx}
         step = skip_count + 1
-        for i in range(1, self.contracts_above + 1): indices.add(adj_atm_idx + (i * step))
-        for i in range(1, self.contracts_below + 1): indices.add(adj_atm_idx - (i * step))
+        lo = adj_atm_idx - self.contracts_below * step
+        hi = adj_atm_idx + self.contracts_above * step
+        # Clamp to the ladder while staying on the same stride from the ATM row
+        if lo < 0:
+            lo += -(lo // step) * step
+        hi = min(hi, len(self.strike_ladder_data) - 1)
+        contract_key = 'call_contract' if self.option_type == OptionType.CALL else 'put_contract'
         strikes = []
-        for idx in sorted(list(indices)):
-            if 0 <= idx < len(self.strike_ladder_data):
-                data = self.strike_ladder_data[idx]
-                key_prefix = 'call' if self.option_type == OptionType.CALL else 'put'
-                contract: Contract = data.get(f'{key_prefix}_contract')
-                if contract:
-                    strikes.append({"strike": data['strike'], "ltp": contract.ltp, "contract": contract})
+        for idx in range(lo, hi + 1, step):
+            data = self.strike_ladder_data[idx]
+            contract: Contract = data.get(contract_key)
+            if contract:
+                strikes.append({"strike": data['strike'], "ltp": contract.ltp, "contract": contract})
         return strikes
 
     def _setup_margin_animation(self):
@@ -1,3 +1,4 @@
+import numpy as np
 import pyqtgraph as pg
 import pandas as pd
 from datetime import datetime, timedelta
@@ -40,6 +41,15 @@ class CVDChartWidget(QWidget):
         self.symbol = symbol
 
         self.cvd_df = None
+        # Raw minute bars kept between refreshes so each tick only fetches the tail
+        self._raw_df = None
+        # Per-load arrays so _plot slices sessions instead of masking the frame
+        self._closes = np.empty(0)
+        self._sessions = []
+        self._session_bounds = []
+        self._time_labels = []
+        # (session date, length, rebased) last uploaded to prev_curve
+        self._prev_curve_key = None
         self.prev_day_close_cvd = 0.0
         self.rebased_mode = True
 
@@ -108,6 +118,16 @@ class CVDChartWidget(QWidget):
         self.plot.getAxis("left").setPen(axis_pen)
         self.plot.getAxis("bottom").setPen(axis_pen)
 
+        # Bottom axis labels come from the HH:MM strings built at load time
+        self.axis.tickStrings = self._tick_strings
+        self.axis.setTickSpacing(major=60, minor=15)
+
+        # Previous and current session curves, created once and refilled via setData
+        self.prev_curve = pg.PlotCurveItem(pen=pg.mkPen("#7A7A7A", width=1.2))
+        self.curr_curve = pg.PlotCurveItem(pen=pg.mkPen("#26A69A", width=1.6))
+        self.plot.addItem(self.prev_curve)
+        self.plot.addItem(self.curr_curve)
+
         # Moving dot (color updated dynamically)
         self.end_dot = pg.ScatterPlotItem(
             size=6,
@@ -128,7 +148,12 @@ class CVDChartWidget(QWidget):
 
         try:
             to_dt = datetime.now()
-            from_dt = to_dt - timedelta(days=2)
+            if self._raw_df is None:
+                from_dt = to_dt - timedelta(days=2)
+            else:
+                # Re-request the last couple of candles; the newest is still forming
+                last_ts = self._raw_df.index[-1].to_pydatetime().replace(tzinfo=None)
+                from_dt = last_ts - timedelta(minutes=2)
 
             hist = self.kite.historical_data(
                 self.instrument_token,
@@ -144,17 +169,33 @@ class CVDChartWidget(QWidget):
             df["date"] = pd.to_datetime(df["date"])
             df.set_index("date", inplace=True)
 
-            cvd_df = CVDHistoricalBuilder.build_cvd_ohlc(df)
+            if self._raw_df is not None:
+                prev = self._raw_df
+                if df.index[-1] == prev.index[-1] and df.iloc[-1].equals(prev.iloc[-1]):
+                    return
+                df = pd.concat([prev[prev.index < df.index[0]], df])
+
+            # Bars older than the two sessions on screen are never needed again
+            days = df.index.date
+            df = df[days >= sorted(set(days))[-2:][0]]
+            self._raw_df = df
+
+            cvd_df = CVDHistoricalBuilder.build_cvd_ohlc(df).sort_index()
 
             cvd_df["session"] = cvd_df.index.date
             sessions = sorted(cvd_df["session"].unique())[-2:]
             cvd_df = cvd_df[cvd_df["session"].isin(sessions)]
 
+            # Rows are time-ordered, so each session is one contiguous run
+            codes = cvd_df["session"].to_numpy()
+            edges = np.searchsorted(codes, sessions).tolist() + [len(codes)]
+            self._sessions = sessions
+            self._session_bounds = list(zip(edges[:-1], edges[1:]))
+            self._closes = cvd_df["close"].to_numpy()
+            self._time_labels = cvd_df.index.strftime("%H:%M").tolist()
+
             if len(sessions) == 2:
-                prev_sess = sessions[0]
-                self.prev_day_close_cvd = (
-                    cvd_df[cvd_df["session"] == prev_sess]["close"].iloc[-1]
-                )
+                self.prev_day_close_cvd = self._closes[edges[1] - 1]
             else:
                 self.prev_day_close_cvd = 0.0
 
@@ -172,36 +213,38 @@ class CVDChartWidget(QWidget):
         if self.cvd_df is None or self.cvd_df.empty:
             return
 
-        self.plot.clear()
-        self.plot.addItem(self.zero_line)
-        self.plot.addItem(self.end_dot)
-
-        sessions = sorted(self.cvd_df["session"].unique())
-        all_times = list(self.cvd_df.index)
+        bounds = self._session_bounds
 
         x_offset = 0
         last_two_y = []
 
-        for i, sess in enumerate(sessions):
-            df_sess = self.cvd_df[self.cvd_df["session"] == sess]
-            y_raw = df_sess["close"].values
-
-            if self.rebased_mode and i == 0 and len(sessions) == 2:
-                y = y_raw - self.prev_day_close_cvd
-            else:
-                y = y_raw
-
-            x = list(range(x_offset, x_offset + len(y)))
-
-            pen = (
-                pg.mkPen("#7A7A7A", width=1.2)
-                if i == 0 and len(sessions) == 2
-                else pg.mkPen("#26A69A", width=1.6)
-            )
-
-            self.plot.addItem(pg.PlotCurveItem(x, y, pen=pen))
-
-            if i == len(sessions) - 1 and len(y) >= 2:
+        # With two sessions the first is the previous day; a lone session is "current"
+        curves = [self.prev_curve, self.curr_curve][-len(bounds):] if bounds else []
+        if len(bounds) < 2:
+            self.prev_curve.setData([], [])
+            self._prev_curve_key = None
+        if not bounds:
+            self.curr_curve.setData([], [])
+
+        for i, ((start, end), curve) in enumerate(zip(bounds, curves)):
+            if curve is self.prev_curve:
+                # A finished session never changes; re-upload only when it rolls
+                # over or the rebased toggle flips
+                key = (self._sessions[0], end - start, self.rebased_mode)
+                if key != self._prev_curve_key:
+                    y = self._closes[start:end]
+                    if self.rebased_mode:
+                        y = y - self.prev_day_close_cvd
+                    curve.setData(np.arange(x_offset, x_offset + len(y)), y)
+                    self._prev_curve_key = key
+                x_offset += end - start
+                continue
+
+            y = self._closes[start:end]
+            x = np.arange(x_offset, x_offset + len(y))
+            curve.setData(x, y)
+
+            if len(y) >= 2:
                 last_two_y = y[-2:].tolist()
                 last_x = x[-1]
                 last_y = y[-1]
@@ -224,22 +267,13 @@ class CVDChartWidget(QWidget):
         else:
             self.end_dot.clear()
 
-        def time_formatter(values, *_):
-            out = []
-            for v in values:
-                idx = int(v)
-                if 0 <= idx < len(all_times):
-                    out.append(all_times[idx].strftime("%H:%M"))
-                else:
-                    out.append("")
-            return out
-
-        self.axis.tickStrings = time_formatter
-        self.axis.setTickSpacing(major=60, minor=15)
-
         self.plot.enableAutoRange(axis=pg.ViewBox.YAxis)
         self.plot.setXRange(0, x_offset, padding=0.02)
 
+    def _tick_strings(self, values, *_):
+        labels = self._time_labels
+        return [labels[i] if 0 <= i < len(labels) else "" for i in map(int, values)]
+
     # ------------------------------------------------------------------
     # Timer
     # ------------------------------------------------------------------
@@ -1,6 +1,6 @@
 # widgets/header_toolbar.py
 import logging
-from datetime import datetime, date
+from datetime import datetime, date, time
 from typing import List, Dict
 
 from PySide6.QtWidgets import (
@@ -11,6 +11,9 @@ from PySide6.QtCore import Qt, Signal
 
 logger = logging.getLogger(__name__)
 
+MARKET_OPEN_TIME = time(9, 15)
+MARKET_CLOSE_TIME = time(15, 30)
+
 
 class HeaderToolbar(QFrame):
     """
@@ -201,11 +204,9 @@ class HeaderToolbar(QFrame):
             self.account_label.setText(f"Account: {account_id}")
 
     def _update_market_status(self):
-        now = datetime.now().time()
-        market_open_time = datetime.strptime("09:15", "%H:%M").time()
-        market_close_time = datetime.strptime("15:30", "%H:%M").time()
-        is_weekday = date.today().weekday() < 5
-        if is_weekday and market_open_time <= now <= market_close_time:
+        now = datetime.now()
+        is_weekday = now.weekday() < 5
+        if is_weekday and MARKET_OPEN_TIME <= now.time() <= MARKET_CLOSE_TIME:
             self.market_status_label.setText("MARKET OPEN")
             self.market_status_label.setStyleSheet("color: #29C7C9;")
         else:
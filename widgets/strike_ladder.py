@@ -47,6 +47,7 @@ class StrikeLadderWidget(QWidget):
         self.num_strikes_below = 15
         self.atm_strike = 0.0
         self.contracts: Dict[float, Dict[str, Contract]] = {}
+        self._contracts_by_token: Dict[int, Contract] = {}
         self.instrument_data = {}
         self.auto_adjust_enabled = True
         self.available_strikes = []
@@ -337,6 +338,7 @@ class StrikeLadderWidget(QWidget):
         self.atm_strike = self._calculate_atm_strike(current_price)
         self._clear_ladder()
         self.contracts.clear()
+        self._contracts_by_token.clear()
         self._fetch_and_build_ladder(symbol, expiry, self._generate_strikes())
 
     def _generate_strikes(self) -> List[float]:
@@ -374,21 +376,20 @@ class StrikeLadderWidget(QWidget):
                                                 expiry=expiry)
                             if strike not in self.contracts: self.contracts[strike] = {}
                             self.contracts[strike][opt_type] = contract
+                            self._contracts_by_token[contract.instrument_token] = contract
                             instruments_to_fetch.append(f"NFO:{inst['tradingsymbol']}")
                             break
         if not instruments_to_fetch: return
         try:
             quotes = self.kite.quote(instruments_to_fetch)
+            by_tradingsymbol = {c.tradingsymbol: c for c in self._contracts_by_token.values()}
             for instrument, quote in quotes.items():
-                tradingsymbol = instrument.split(':')[-1]
-                for strike_contracts in self.contracts.values():
-                    for contract in strike_contracts.values():
-                        if contract.tradingsymbol == tradingsymbol:
-                            contract.ltp, contract.oi = quote.get('last_price', 0.0), quote.get('oi', 0)
-                            depth = quote.get('depth', {})
-                            if depth and depth.get('buy'): contract.bid = depth['buy'][0]['price']
-                            if depth and depth.get('sell'): contract.ask = depth['sell'][0]['price']
-                            break
+                contract = by_tradingsymbol.get(instrument.split(':')[-1])
+                if contract is None: continue
+                contract.ltp, contract.oi = quote.get('last_price', 0.0), quote.get('oi', 0)
+                depth = quote.get('depth', {})
+                if depth and depth.get('buy'): contract.bid = depth['buy'][0]['price']
+                if depth and depth.get('sell'): contract.ask = depth['sell'][0]['price']
             self._redisplay_ladder()
         except Exception as e:
             logger.error(f"Failed to fetch initial quotes for {symbol}: {e}")
@@ -410,19 +411,19 @@ class StrikeLadderWidget(QWidget):
     def update_prices(self, data: Union[dict, list]):
         ticks = data if isinstance(data, list) else [data]
         updated_contracts = False
-        ticks_by_token = {tick['instrument_token']: tick for tick in ticks}
-        for strike, strike_contracts in self.contracts.items():
-            for contract in strike_contracts.values():
-                if contract and contract.instrument_token in ticks_by_token:
-                    updated_contracts = True
-                    tick = ticks_by_token[contract.instrument_token]
-                    contract.ltp = tick.get('last_price', contract.ltp)
-                    depth = tick.get('depth', {})
-                    if depth and depth.get('buy'): contract.bid = depth['buy'][0]['price']
-                    if depth and depth.get('sell'): contract.ask = depth['sell'][0]['price']
-                    contract.oi = tick.get('oi', contract.oi)
+        # Only the ticked contracts are touched, not every row of the ladder
+        by_token = self._contracts_by_token
+        for tick in ticks:
+            contract = by_token.get(tick['instrument_token'])
+            if contract is None: continue
+            updated_contracts = True
+            contract.ltp = tick.get('last_price', contract.ltp)
+            depth = tick.get('depth', {})
+            if depth and depth.get('buy'): contract.bid = depth['buy'][0]['price']
+            if depth and depth.get('sell'): contract.ask = depth['sell'][0]['price']
+            contract.oi = tick.get('oi', contract.oi)
         if updated_contracts:
-            all_oi = [c.oi for sc in self.contracts.values() for c in sc.values() if c and c.oi > 0]
+            all_oi = [c.oi for c in by_token.values() if c.oi > 0]
             self._max_oi = max(all_oi) if all_oi else 1
             self._update_ladder_ui()
 